@@ -5,54 +5,63 @@ from __future__ import annotations
 
 import argparse
 import json
+import re
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Optional, Sequence, Tuple
 
 DEFAULT_CASES = Path("evals/ext_v1/cases.jsonl")
 DEFAULT_REFUSALS = Path("evals/ext_v1/refusals.jsonl")
 DEFAULT_OUT = Path("evals/ext_v1/evalset.jsonl")
+WRITE_BUFFER_SIZE = 1 << 20
+# Generated cases always lead with the id, so it can be read without a full parse.
+_LEADING_ID = re.compile(rb'^\{\s*"id"\s*:\s*"([^"\\]*)"')
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build the merged ext_v1 evalset.")
     parser.add_argument("--cases", type=Path, default=DEFAULT_CASES, help="Answered cases JSONL.")
     parser.add_argument(
         "--refusals", type=Path, default=DEFAULT_REFUSALS, help="Refusal template JSONL."
     )
     parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="Output evalset JSONL path.")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def load_jsonl(path: Path) -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            stripped = line.strip()
-            if not stripped:
-                continue
-            items.append(json.loads(stripped))
+def load_jsonl(path: Path) -> List[Tuple[Optional[str], bytes]]:
+    """Return ``(id, raw_line)`` pairs; lines are kept verbatim for pass-through."""
+    items: List[Tuple[Optional[str], bytes]] = []
+    for line in path.read_bytes().splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        items.append((_extract_id(stripped), stripped))
     return items
 
 
-def main() -> None:
-    args = parse_args()
+def _extract_id(line: bytes) -> Optional[str]:
+    match = _LEADING_ID.match(line)
+    if match:
+        return match.group(1).decode("utf-8")
+    return json.loads(line).get("id")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
     cases = load_jsonl(args.cases)
     refusals = load_jsonl(args.refusals)
     combined = cases + refusals
 
-    seen = set()
-    for case in combined:
-        case_id = case.get("id")
-        if not case_id:
-            raise ValueError("Case missing 'id' field.")
-        if case_id in seen:
-            raise ValueError(f"Duplicate case id detected: {case_id}")
-        seen.add(case_id)
+    id_counts = Counter(case_id for case_id, _ in combined)
+    if None in id_counts or "" in id_counts:
+        raise ValueError("Case missing 'id' field.")
+    duplicate = next((case_id for case_id, count in id_counts.items() if count > 1), None)
+    if duplicate is not None:
+        raise ValueError(f"Duplicate case id detected: {duplicate}")
 
     args.out.parent.mkdir(parents=True, exist_ok=True)
-    with args.out.open("w", encoding="utf-8") as handle:
-        for case in combined:
-            handle.write(json.dumps(case) + "\n")
+    with args.out.open("wb", buffering=WRITE_BUFFER_SIZE) as handle:
+        handle.writelines(line + b"\n" for _, line in combined)
 
     print(
         f"[ext_v1] evalset built -> {args.out} (answered={len(cases)}, refusals={len(refusals)}, total={len(combined)})"
@@ -4,120 +4,119 @@
 from __future__ import annotations
 
 import argparse
-import copy
+import functools
 import json
 import random
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional, Sequence, Tuple
 
 import sys
 
-try:
-    import yaml  # type: ignore[import]
-except ModuleNotFoundError as exc:  # pragma: no cover
-    raise SystemExit("pyyaml is required to run this script.") from exc
-
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from src.util import load_series_config  # noqa: E402
+
 DEFAULT_GOLDEN = ROOT / "evals" / "ext_v1" / "golden.jsonl"
 DEFAULT_OUT = ROOT / "evals" / "ext_v1" / "cases.jsonl"
 CONFIG_PATH = ROOT / "config" / "series.yaml"
+WRITE_BUFFER_SIZE = 1 << 20
 
-POINT_TEMPLATES = [
+POINT_TEMPLATES = (
     "What was {series} in {date}?",
     "Give me {series} for {date}.",
     "Report the value of {series} as of {date}.",
-]
+)
 
-CHANGE_TEMPLATES = [
+CHANGE_TEMPLATES = (
     "What was the {label} for {series} in {date}?",
     "Provide the {label} of {series} for {date}.",
     "How large was the {label} in {date} for {series}?",
-]
+)
 
-MA_TEMPLATES = [
+MA_TEMPLATES = (
     "What was the {period}-period moving average of {series} in {date}?",
     "Report the {period}-month moving average for {series} as of {date}.",
     "Give me the {period}-period MA for {series} at {date}.",
-]
+)
 
-EXTREME_TEMPLATES = [
+EXTREME_TEMPLATES = (
     "What was the {label} value of {series} {window}?",
     "Tell me the {label} reading for {series} {window}.",
     "How {label_adj} did {series} get {window}?",
-]
+)
 
-YOY_LABELS = ["year-over-year change", "YoY change", "annual change"]
-MOM_LABELS = ["month-over-month change", "MoM change", "monthly change"]
-MAX_LABELS = [
+YOY_LABELS = ("year-over-year change", "YoY change", "annual change")
+MOM_LABELS = ("month-over-month change", "MoM change", "monthly change")
+MAX_LABELS = (
     ("highest", "high"),
     ("maximum", "high"),
-]
-MIN_LABELS = [
+)
+MIN_LABELS = (
     ("lowest", "low"),
     ("minimum", "low"),
-]
+)
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Expand golden truth specs into templated questions.")
     parser.add_argument("--golden", type=Path, default=DEFAULT_GOLDEN, help="Path to golden JSONL.")
     parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="Output JSONL path.")
     parser.add_argument("--variants", type=int, default=2, help="Number of question variants per truth spec.")
     parser.add_argument("--seed", type=int, default=123, help="Deterministic RNG seed.")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def load_series_titles() -> Dict[str, str]:
-    data = yaml.safe_load(CONFIG_PATH.read_text(encoding="utf-8"))
+    data = load_series_config(CONFIG_PATH)
     titles = {}
     for entry in data.get("series", []):
         titles[entry["id"]] = entry.get("title") or entry["id"]
     return titles
 
 
-def format_date_options(date_str: Optional[str]) -> List[str]:
+@functools.lru_cache(maxsize=4096)
+def format_date_options(date_str: Optional[str]) -> Tuple[str, ...]:
     if not date_str:
-        return []
+        return ()
     dt = datetime.fromisoformat(date_str).date()
-    return [
+    return (
         dt.strftime("%B %Y"),
         dt.strftime("%b %Y"),
         dt.strftime("%Y-%m"),
-    ]
+    )
 
 
-def format_window_options(window: Dict[str, str]) -> List[str]:
-    start = window.get("start")
-    end = window.get("end")
+@functools.lru_cache(maxsize=4096)
+def format_window_options(start: Optional[str], end: Optional[str]) -> Tuple[str, ...]:
     if not start or not end:
-        return []
-    start_long = datetime.fromisoformat(start).strftime("%B %Y")
-    end_long = datetime.fromisoformat(end).strftime("%B %Y")
-    start_short = datetime.fromisoformat(start).strftime("%Y-%m")
-    end_short = datetime.fromisoformat(end).strftime("%Y-%m")
-    return [
+        return ()
+    start_dt = datetime.fromisoformat(start)
+    end_dt = datetime.fromisoformat(end)
+    start_long = start_dt.strftime("%B %Y")
+    end_long = end_dt.strftime("%B %Y")
+    start_short = start_dt.strftime("%Y-%m")
+    end_short = end_dt.strftime("%Y-%m")
+    return (
         f"between {start_long} and {end_long}",
         f"between {start_short} and {end_short}",
         f"from {start_long} to {end_long}",
         f"from {start_short} to {end_short}",
-    ]
+    )
 
 
-def main() -> None:
-    args = parse_args()
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
     rng = random.Random(args.seed)
     titles = load_series_titles()
     args.out.parent.mkdir(parents=True, exist_ok=True)
 
-    with args.golden.open("r", encoding="utf-8") as reader, args.out.open(
-        "w", encoding="utf-8"
-    ) as writer:
+    golden_lines = args.golden.read_text(encoding="utf-8").split("\n")
+    with args.out.open("w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as writer:
         total = 0
-        for line in reader:
+        for line in golden_lines:
             stripped = line.strip()
             if not stripped:
                 continue
@@ -129,6 +128,11 @@ def main() -> None:
             series_id = expect.get("series_id") or truth_spec.get("series_id")
             transform = expect.get("transform") or truth_spec.get("transform")
             base_id = case["id"]
+            base_meta = case.get("meta") or {}
+            # expect/truth_spec are identical across variants: encode them once per row.
+            shared_json = (
+                f', "expect": {json.dumps(expect)}, "truth_spec": {json.dumps(truth_spec)}, "meta": '
+            )
             for variant_idx in range(args.variants):
                 question, template_name = build_question(
                     rng,
@@ -136,19 +140,18 @@ def main() -> None:
                     titles.get(series_id, series_id),
                     truth_spec,
                 )
-                variant = {
-                    "id": f"{base_id}__v{variant_idx+1}",
-                    "question": question,
-                    "expect": copy.deepcopy(expect),
-                    "truth_spec": copy.deepcopy(truth_spec),
-                    "meta": {
-                        **(case.get("meta") or {}),
-                        "variant_index": variant_idx + 1,
-                        "template": template_name,
-                        "question_seed": args.seed,
-                    },
+                meta = {
+                    **base_meta,
+                    "variant_index": variant_idx + 1,
+                    "template": template_name,
+                    "question_seed": args.seed,
                 }
-                writer.write(json.dumps(variant) + "\n")
+                variant_id = f"{base_id}__v{variant_idx+1}"
+                # Same bytes json.dumps() would emit for the full variant dict.
+                writer.write(
+                    f'{{"id": {json.dumps(variant_id)}, "question": {json.dumps(question)}'
+                    f"{shared_json}{json.dumps(meta)}}}\n"
+                )
                 total += 1
         print(f"[ext_v1] Wrote {total} question variants to {args.out}")
 
@@ -182,7 +185,7 @@ def _build_point_question(
 
 
 def _build_change_question(
-    rng: random.Random, series_title: str, truth_spec: Dict[str, str], labels: List[str]
+    rng: random.Random, series_title: str, truth_spec: Dict[str, str], labels: Sequence[str]
 ) -> Tuple[str, str]:
     template = rng.choice(CHANGE_TEMPLATES)
     date_options = format_date_options(truth_spec.get("date"))
@@ -207,10 +210,11 @@ def _build_extreme_question(
     rng: random.Random,
     series_title: str,
     truth_spec: Dict[str, str],
-    labels: List[tuple],
+    labels: Sequence[Tuple[str, str]],
 ) -> Tuple[str, str]:
     template = rng.choice(EXTREME_TEMPLATES)
-    window_options = format_window_options(truth_spec.get("window", {}))
+    window = truth_spec.get("window", {})
+    window_options = format_window_options(window.get("start"), window.get("end"))
     window_text = rng.choice(window_options or ["between the requested dates"])
     label, adj = rng.choice(labels)
     question = template.format(series=series_title, window=window_text, label=label, label_adj=adj)
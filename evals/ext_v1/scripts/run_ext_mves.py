@@ -4,13 +4,22 @@
 from __future__ import annotations
 
 import argparse
+import importlib.util
 import subprocess
 import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[3]
+EXT_DIR = ROOT / "evals" / "ext_v1"
+
+# ext_v1 and ext_v2 each ship a load_spec.py; load this one under its own name rather than
+# via sys.path, where whichever directory was inserted first would shadow the other.
+_LOAD_SPEC = importlib.util.spec_from_file_location("ext_v1_load_spec", EXT_DIR / "load_spec.py")
+_load_spec = importlib.util.module_from_spec(_LOAD_SPEC)
+sys.modules[_LOAD_SPEC.name] = _load_spec
+_LOAD_SPEC.loader.exec_module(_load_spec)
+merge_files = _load_spec.merge_files
 
-LOAD_SPEC = ROOT / "evals" / "ext_v1" / "load_spec.py"
 MVES_RUN = ROOT / "scripts" / "mves_run.py"
 
 DEFAULT_EVAL = ROOT / "evals" / "ext_v1" / "evalset.jsonl"
@@ -38,27 +47,19 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def run_load_spec(base_flag: str, base_path: Path, override: Path, out_path: Path) -> None:
-    cmd = [
-        sys.executable,
-        str(LOAD_SPEC),
-        base_flag,
-        str(base_path),
-        "--override",
-        str(override),
-        "--out",
-        str(out_path),
-    ]
-    subprocess.run(cmd, check=True, cwd=ROOT)
+def _from_root(path: Path) -> Path:
+    """Resolve a relative CLI path against the repo root, independent of the caller's cwd."""
+    return path if path.is_absolute() else ROOT / path
 
 
 def main() -> None:
     args = parse_args()
-    args.spec_out.parent.mkdir(parents=True, exist_ok=True)
-    args.verifiers_out.parent.mkdir(parents=True, exist_ok=True)
-
-    run_load_spec("--base-spec", args.spec_base, args.spec_override, args.spec_out)
-    run_load_spec("--base-verifiers", args.verifiers_base, args.verifiers_override, args.verifiers_out)
+    for key, value in list(vars(args).items()):
+        if isinstance(value, Path):
+            setattr(args, key, _from_root(value))
+    # Merge in-process; only the MVES runner itself needs a separate interpreter.
+    merge_files(args.spec_base, args.spec_override, args.spec_out)
+    merge_files(args.verifiers_base, args.verifiers_override, args.verifiers_out)
 
     cmd = [
         sys.executable,
@@ -78,7 +79,7 @@ def main() -> None:
         "--refusals",
         "",
     ]
-    subprocess.run(cmd, check=True, cwd=ROOT)
+    subprocess.run(cmd, check=True)
 
 
 if __name__ == "__main__":
@@ -4,33 +4,34 @@
 from __future__ import annotations
 
 import argparse
+import array
 import json
 import logging
 import random
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date
+from itertools import groupby
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import duckdb  # type: ignore[import]
 import sys
 
-try:
-    import yaml  # type: ignore[import]
-except ModuleNotFoundError as exc:  # pragma: no cover
-    raise SystemExit("pyyaml is required to run this script.") from exc
-
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from src import truth  # noqa: E402
+from src.util import load_series_config  # noqa: E402
 
 DEFAULT_DB = ROOT / "data" / "warehouse.duckdb"
 DEFAULT_OUT = ROOT / "evals" / "ext_v2" / "golden.jsonl"
 CONFIG_PATH = ROOT / "config" / "series.yaml"
 TRANSFORMS = ("point", "yoy", "mom", "ma", "max", "min")
+TRANSFORM_IDX = {transform: idx for idx, transform in enumerate(TRANSFORMS)}
 TRANSFORM_WEIGHTS = {
     "point": 1,
     "yoy": 2,
@@ -41,20 +42,24 @@ TRANSFORM_WEIGHTS = {
 }
 MA_PERIOD_CHOICES = (3, 5, 6, 12)
 TOLERANCE = 1e-6
+WRITE_BUFFER_SIZE = 1 << 20
 
 
 @dataclass
 class SampleContext:
     rng: random.Random
-    conn: duckdb.DuckDBPyConnection
     series_id: str
     dates: List[str]
-    date_positions: Dict[str, int]
-    id_counters: Dict[str, int]
+    frequency: str
+    obs_dates: List[str]
+    obs_values: List[Optional[float]]
+    values_by_date: Dict[str, Optional[float]]
+    index_scratch: List[int]
+    id_counters: array.array
     seed: int
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate MVES golden cases from DuckDB.")
     parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="Path to DuckDB warehouse.")
     parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="Output JSONL file.")
@@ -85,45 +90,66 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Print per-sample debugging information.",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def load_series_ids(override: Optional[Sequence[str]]) -> List[str]:
     if override:
         return list(override)
-    config = yaml.safe_load(CONFIG_PATH.read_text(encoding="utf-8"))
+    config = load_series_config(CONFIG_PATH)
     return [entry["id"] for entry in config.get("series", [])]
 
 
 def load_dates_for_series(
-    conn: duckdb.DuckDBPyConnection, series_id: str, date_min: Optional[str], date_max: Optional[str]
+    obs_dates: Sequence[str], date_min: Optional[str], date_max: Optional[str]
 ) -> List[str]:
-    clauses = ["series_id = ?"]
-    params: List[object] = [series_id]
-    if date_min:
-        clauses.append("date >= ?")
-        params.append(date_min)
-    if date_max:
-        clauses.append("date <= ?")
-        params.append(date_max)
-    where = " AND ".join(clauses)
-    query = f"SELECT date FROM observations WHERE {where} ORDER BY date ASC"
-    rows = conn.execute(query, params).fetchall()
-    raw_dates = [row[0] for row in rows]
+    """Apply the optional date bounds to a series' ordered dates and keep month starts."""
+    lower = date.fromisoformat(date_min).isoformat() if date_min else None
+    upper = date.fromisoformat(date_max).isoformat() if date_max else None
+    raw_dates = [
+        d for d in obs_dates if (lower is None or d >= lower) and (upper is None or d <= upper)
+    ]
     if not raw_dates:
         return []
     return _promote_to_month_starts(raw_dates)
 
 
+def fetch_values(
+    conn: duckdb.DuckDBPyConnection, series_ids: Sequence[str]
+) -> Dict[str, Tuple[List[str], List[Optional[float]]]]:
+    """Fetch every observation for the requested series in one scan (oldest -> newest)."""
+    if not series_ids:
+        return {}
+    placeholders = ", ".join("?" for _ in series_ids)
+    rows = conn.execute(
+        "SELECT series_id, date, value FROM observations "
+        f"WHERE series_id IN ({placeholders}) ORDER BY series_id, date ASC",
+        list(series_ids),
+    ).fetchall()
+    per_series: Dict[str, Tuple[List[str], List[Optional[float]]]] = {}
+    for series_id, group in groupby(rows, key=lambda row: row[0]):
+        group_rows = list(group)
+        per_series[series_id] = (
+            [str(row[1])[:10] for row in group_rows],
+            [float(row[2]) if row[2] is not None else None for row in group_rows],
+        )
+    return per_series
+
+
 def _promote_to_month_starts(date_values: Iterable[str]) -> List[str]:
-    """Reduce to one observation per month (first available entry)."""
-    per_month: Dict[str, str] = {}
+    """Reduce to one observation per month (first available entry).
+
+    Expects ISO dates in ascending order (as returned by ``load_dates_for_series``),
+    so the month key is just the ``YYYY-MM`` prefix and no re-sort is needed.
+    """
+    seen: set[str] = set()
+    ordered: List[str] = []
     for raw in date_values:
-        dt = datetime.fromisoformat(str(raw)).date()
-        month_key = dt.strftime("%Y-%m")
-        if month_key not in per_month:
-            per_month[month_key] = dt.isoformat()
-    ordered = [per_month[key] for key in sorted(per_month.keys())]
+        iso = str(raw)[:10]
+        month_key = iso[:7]
+        if month_key not in seen:
+            seen.add(month_key)
+            ordered.append(iso)
     return ordered
 
 
@@ -153,25 +179,35 @@ def allocate_counts(per_series: int) -> Dict[str, int]:
     return counts
 
 
-def main() -> None:
-    args = parse_args()
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
     logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
     rng = random.Random(args.seed)
     conn = duckdb.connect(str(args.db), read_only=True)
     try:
         series_ids = load_series_ids(args.series)
         args.out.parent.mkdir(parents=True, exist_ok=True)
-        with args.out.open("w", encoding="utf-8") as handle:
+        # A single writer thread encodes/writes each batch (in submission order) while the
+        # main thread keeps sampling the next transform.
+        with args.out.open(
+            "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE
+        ) as handle, ThreadPoolExecutor(max_workers=1) as writer:
+            pending: List[Future] = []
             summary = defaultdict(lambda: defaultdict(lambda: {"requested": 0, "produced": 0}))
+            observations = fetch_values(conn, series_ids)
             for series_id in series_ids:
-                dates = load_dates_for_series(conn, series_id, args.date_min, args.date_max)
+                obs_dates, obs_values = observations.get(series_id, ([], []))
+                dates = load_dates_for_series(obs_dates, args.date_min, args.date_max)
                 ctx = SampleContext(
                     rng=rng,
-                    conn=conn,
                     series_id=series_id,
                     dates=dates,
-                    date_positions={d: idx for idx, d in enumerate(dates)},
-                    id_counters=defaultdict(int),
+                    frequency=truth.get_frequency(conn, series_id),
+                    obs_dates=obs_dates,
+                    obs_values=obs_values,
+                    values_by_date=dict(zip(obs_dates, obs_values)),
+                    index_scratch=list(range(len(dates))),
+                    id_counters=array.array("i", [0] * len(TRANSFORMS)),
                     seed=args.seed,
                 )
                 counts = allocate_counts(args.per_series)
@@ -180,8 +216,7 @@ def main() -> None:
                     if requested == 0:
                         continue
                     produced = list(_sample_transform(ctx, transform, requested))
-                    for record in produced:
-                        handle.write(json.dumps(record) + "\n")
+                    pending.append(writer.submit(_write_records, handle, produced))
                     summary[series_id][transform]["produced"] = len(produced)
                     if len(produced) < requested:
                         logging.warning(
@@ -192,24 +227,30 @@ def main() -> None:
                             series_id,
                             requested,
                         )
+            for future in pending:
+                future.result()
             _print_summary(summary)
     finally:
         conn.close()
 
 
+def _write_records(handle, records: List[Dict[str, Any]]) -> None:
+    handle.writelines(json.dumps(record) + "\n" for record in records)
+
+
 def _sample_transform(ctx: SampleContext, transform: str, requested: int) -> Iterable[Dict[str, Any]]:
     if transform == "point":
         yield from _sample_point(ctx, requested)
     elif transform == "yoy":
-        yield from _sample_change(ctx, requested, transform, truth.get_yoy)
+        yield from _sample_change(ctx, requested, transform, truth.shift_for_yoy)
     elif transform == "mom":
-        yield from _sample_change(ctx, requested, transform, truth.get_mom)
+        yield from _sample_change(ctx, requested, transform, truth.shift_for_mom)
     elif transform == "ma":
         yield from _sample_ma(ctx, requested)
     elif transform == "max":
-        yield from _sample_extrema(ctx, requested, transform, truth.get_max)
+        yield from _sample_extrema(ctx, requested, transform, max)
     elif transform == "min":
-        yield from _sample_extrema(ctx, requested, transform, truth.get_min)
+        yield from _sample_extrema(ctx, requested, transform, min)
     else:  # pragma: no cover
         return []
 
@@ -218,14 +259,15 @@ def _sample_point(ctx: SampleContext, requested: int) -> Iterable[Dict[str, Any]
     remaining = requested
     if remaining <= 0:
         return
-    for date_value in _shuffle(ctx.rng, ctx.dates):
+    for idx in _iter_random_indices(ctx):
+        date_value = ctx.dates[idx]
         truth_spec = {
             "series_id": ctx.series_id,
             "transform": "point",
             "date": date_value,
             "tolerance": TOLERANCE,
         }
-        value = truth.get_point(ctx.conn, ctx.series_id, date_value)
+        value = ctx.values_by_date.get(date_value)
         if value is None:
             continue
         yield _build_record(ctx, "point", truth_spec)
@@ -234,18 +276,24 @@ def _sample_point(ctx: SampleContext, requested: int) -> Iterable[Dict[str, Any]
             break
 
 
-def _sample_change(ctx: SampleContext, requested: int, transform: str, fn) -> Iterable[Dict[str, Any]]:
+def _sample_change(
+    ctx: SampleContext,
+    requested: int,
+    transform: str,
+    shift: Callable[[str, str], str],
+) -> Iterable[Dict[str, Any]]:
     remaining = requested
     if remaining <= 0:
         return
-    for date_value in _shuffle(ctx.rng, ctx.dates):
+    for idx in _iter_random_indices(ctx):
+        date_value = ctx.dates[idx]
         truth_spec = {
             "series_id": ctx.series_id,
             "transform": transform,
             "date": date_value,
             "tolerance": TOLERANCE,
         }
-        value = fn(ctx.conn, ctx.series_id, date_value)
+        value = _change_value(ctx, date_value, shift)
         if value is None:
             continue
         yield _build_record(ctx, transform, truth_spec)
@@ -258,9 +306,9 @@ def _sample_ma(ctx: SampleContext, requested: int) -> Iterable[Dict[str, Any]]:
     remaining = requested
     if remaining <= 0:
         return
-    for date_value in _shuffle(ctx.rng, ctx.dates):
+    for idx in _iter_random_indices(ctx):
+        date_value = ctx.dates[idx]
         periods = ctx.rng.choice(MA_PERIOD_CHOICES)
-        idx = ctx.date_positions.get(date_value, -1)
         if idx < periods - 1:
             continue
         truth_spec = {
@@ -270,7 +318,7 @@ def _sample_ma(ctx: SampleContext, requested: int) -> Iterable[Dict[str, Any]]:
             "periods": periods,
             "tolerance": TOLERANCE,
         }
-        value = truth.get_ma(ctx.conn, ctx.series_id, date_value, periods)
+        value = _ma_value(ctx, date_value, periods)
         if value is None:
             continue
         yield _build_record(ctx, "ma", truth_spec, extra_meta={"periods": periods})
@@ -279,42 +327,83 @@ def _sample_ma(ctx: SampleContext, requested: int) -> Iterable[Dict[str, Any]]:
             break
 
 
-def _sample_extrema(ctx: SampleContext, requested: int, transform: str, fn) -> Iterable[Dict[str, Any]]:
-    if len(ctx.dates) < 2:
+def _sample_extrema(
+    ctx: SampleContext,
+    requested: int,
+    transform: str,
+    pick: Callable[[List[float]], float],
+) -> Iterable[Dict[str, Any]]:
+    n_dates = len(ctx.dates)
+    if n_dates < 2:
         return []
+    # The draw sequence is part of the seeded output contract, so windows are still drawn
+    # one pair at a time; rejected attempts just skip all record construction.
+    randrange = ctx.rng.randrange
     attempts = 0
     max_attempts = requested * 20 + 20
     remaining = requested
     while remaining > 0 and attempts < max_attempts:
         attempts += 1
-        start_idx = ctx.rng.randrange(0, len(ctx.dates) - 1)
-        end_idx = ctx.rng.randrange(start_idx + 1, len(ctx.dates))
+        start_idx = randrange(0, n_dates - 1)
+        end_idx = randrange(start_idx + 1, n_dates)
         if end_idx - start_idx < 2:
             continue
         window_start = ctx.dates[start_idx]
         window_end = ctx.dates[end_idx]
+        if _extrema_value(ctx, window_start, window_end, pick) is None:
+            continue
         truth_spec = {
             "series_id": ctx.series_id,
             "transform": transform,
             "window": {"start": window_start, "end": window_end},
             "tolerance": TOLERANCE,
         }
-        _, value = fn(ctx.conn, ctx.series_id, window_start, window_end)
-        if value is None:
-            continue
         extra_meta = {"window_span": f"{window_start}:{window_end}"}
         yield _build_record(ctx, transform, truth_spec, extra_meta=extra_meta)
         remaining -= 1
 
 
+def _change_value(ctx: SampleContext, date_value: str, shift: Callable[[str, str], str]) -> Optional[float]:
+    """Mirror truth.get_yoy/get_mom against the cached observations."""
+    current = ctx.values_by_date.get(date_value)
+    if current is None:
+        return None
+    previous = ctx.values_by_date.get(shift(date_value, ctx.frequency))
+    return truth.percent_change(current, previous)
+
+
+def _ma_value(ctx: SampleContext, date_value: str, periods: int) -> Optional[float]:
+    """Mirror truth.get_ma against the cached observations."""
+    end = bisect_right(ctx.obs_dates, date_value)
+    if end < periods:
+        return None
+    window = ctx.obs_values[end - periods : end]
+    if any(value is None for value in window):
+        return None
+    return float(sum(window) / periods)
+
+
+def _extrema_value(
+    ctx: SampleContext, window_start: str, window_end: str, pick: Callable[[List[float]], float]
+) -> Optional[float]:
+    """Mirror truth.get_max/get_min (inclusive window, nulls ignored) on cached observations."""
+    lo = bisect_left(ctx.obs_dates, window_start)
+    hi = bisect_right(ctx.obs_dates, window_end)
+    values = [value for value in ctx.obs_values[lo:hi] if value is not None]
+    if not values:
+        return None
+    return pick(values)
+
+
 def _build_record(
     ctx: SampleContext,
     transform: str,
     truth_spec: Dict[str, Any],
     extra_meta: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
-    idx = ctx.id_counters[transform]
-    ctx.id_counters[transform] += 1
+    slot = TRANSFORM_IDX[transform]
+    idx = ctx.id_counters[slot]
+    ctx.id_counters[slot] = idx + 1
     record_id = f"{ctx.series_id}_{transform}_{idx}"
     record = {
         "id": record_id,
@@ -338,10 +427,17 @@ def _build_record(
     return record
 
 
-def _shuffle(rng: random.Random, values: Sequence[str]) -> List[str]:
-    items = list(values)
-    rng.shuffle(items)
-    return items
+def _iter_random_indices(ctx: SampleContext) -> Iterator[int]:
+    """Yield date indices in shuffled order using the context's reusable scratch list.
+
+    The scratch is reset to identity before shuffling so the permutation (and the RNG
+    stream) matches shuffling a fresh copy of ``ctx.dates``. Callers must exhaust or
+    abandon one iterator before starting the next.
+    """
+    order = ctx.index_scratch
+    order[:] = range(len(ctx.dates))
+    ctx.rng.shuffle(order)
+    yield from order
 
 
 def _print_summary(summary: Dict[str, Dict[str, Dict[str, int]]]) -> None:
@@ -4,14 +4,17 @@
 from __future__ import annotations
 
 import argparse
+import copy
 import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
-try:
-    import yaml  # type: ignore[import]
-except ModuleNotFoundError:  # pragma: no cover
-    yaml = None  # type: ignore[assignment]
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.util import yaml_safe_load  # noqa: E402
 
 
 def parse_args() -> argparse.Namespace:
@@ -40,25 +43,34 @@ def parse_args() -> argparse.Namespace:
 
 def load_data(path: Path) -> Any:
     text = path.read_text(encoding="utf-8")
-    if path.suffix.lower() in {".yaml", ".yml"} and yaml is not None:
-        return yaml.safe_load(text)
+    if path.suffix.lower() in {".yaml", ".yml"}:
+        try:
+            return yaml_safe_load(text)
+        except ModuleNotFoundError:  # pragma: no cover - fall back to JSON-compatible YAML
+            pass
     return json.loads(text)
 
 
 def deep_merge(base: Any, override: Any) -> Any:
+    """Return ``override`` merged onto a copy of ``base``; ``base`` itself is not modified."""
+    return _merge_into(copy.deepcopy(base), override)
+
+
+def _merge_into(base: Any, override: Any) -> Any:
+    # ``base`` is owned by the caller (copied once in deep_merge), so mutate it in place.
     if isinstance(base, dict) and isinstance(override, dict):
-        merged: Dict[str, Any] = dict(base)
         for key, value in override.items():
-            if key in merged:
-                merged[key] = deep_merge(merged[key], value)
+            if key in base:
+                base[key] = _merge_into(base[key], value)
             else:
-                merged[key] = value
-        return merged
+                base[key] = value
+        return base
 
     if isinstance(base, list) and isinstance(override, list):
         if _list_is_dicts_with_id(base) or _list_is_dicts_with_id(override):
             return _merge_list_by_id(base, override)
-        return base + override
+        base.extend(override)
+        return base
 
     return override
 
@@ -70,28 +82,30 @@ def _list_is_dicts_with_id(value: Any) -> bool:
 
 
 def _merge_list_by_id(base: List[Dict[str, Any]], override: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    merged = [dict(item) for item in base]
-    index = {item.get("id"): idx for idx, item in enumerate(merged) if "id" in item}
+    index = {item.get("id"): idx for idx, item in enumerate(base) if "id" in item}
     for entry in override:
         entry_id = entry.get("id")
         if entry_id in index:
-            merged[index[entry_id]] = deep_merge(merged[index[entry_id]], entry)
+            position = index[entry_id]
+            base[position] = _merge_into(base[position], entry)
         else:
-            merged.append(entry)
+            base.append(entry)
+    return base
+
+
+def merge_files(base_path: Path, override_path: Path, out_path: Path) -> Any:
+    """Deep-merge ``override_path`` onto ``base_path`` and write the JSON result."""
+    merged = deep_merge(load_data(base_path), load_data(override_path))
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(merged, indent=2), encoding="utf-8")
+    print(f"[load_spec] Wrote merged file to {out_path}", flush=True)
     return merged
 
 
 def main() -> None:
     args = parse_args()
-    if args.base_spec:
-        base = load_data(args.base_spec)
-    else:
-        base = load_data(args.base_verifiers)
-    override = load_data(args.override)
-    merged = deep_merge(base, override)
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps(merged, indent=2), encoding="utf-8")
-    print(f"[load_spec] Wrote merged file to {args.out}", flush=True)
+    base_path = args.base_spec if args.base_spec else args.base_verifiers
+    merge_files(base_path, args.override, args.out)
 
 
 if __name__ == "__main__":
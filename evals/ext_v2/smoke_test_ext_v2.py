@@ -3,50 +3,50 @@
 
 from __future__ import annotations
 
-import json
-import subprocess
+import importlib.util
 import sys
 import tempfile
 from pathlib import Path
 from typing import Dict, Any, List
 
-import duckdb  # type: ignore[import]
-
 ROOT = Path(__file__).resolve().parents[2]
+EXT_DIR = ROOT / "evals" / "ext_v2"
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from src import truth  # noqa: E402
+from src import truth, warehouse  # noqa: E402
+from src.util import json_loads  # noqa: E402
 
-GOLDEN_SCRIPT = ROOT / "evals" / "ext_v2" / "generate_golden_from_duckdb.py"
-QUESTION_SCRIPT = ROOT / "evals" / "ext_v2" / "generate_questions.py"
-BUILD_SCRIPT = ROOT / "evals" / "ext_v2" / "build_evalset.py"
-REFUSALS_PATH = ROOT / "evals" / "ext_v2" / "refusals.jsonl"
-DB_PATH = ROOT / "data" / "warehouse.duckdb"
+
+def _load_stage(name: str):
+    # ext_v1 and ext_v2 ship same-named stage scripts, so load each under a prefixed name
+    # instead of putting EXT_DIR on sys.path where the first one imported would win.
+    module_name = f"ext_v2_{name}"
+    spec = importlib.util.spec_from_file_location(module_name, EXT_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module  # dataclasses resolve annotations through sys.modules
+    spec.loader.exec_module(module)
+    return module
 
 
-def run_script(script: Path, *args: str) -> None:
-    cmd = [sys.executable, str(script), *args]
-    subprocess.run(cmd, check=True, cwd=ROOT)
+build_evalset = _load_stage("build_evalset")
+generate_golden_from_duckdb = _load_stage("generate_golden_from_duckdb")
+generate_questions = _load_stage("generate_questions")
+
+REFUSALS_PATH = EXT_DIR / "refusals.jsonl"
+DB_PATH = ROOT / "data" / "warehouse.duckdb"
 
 
 def load_jsonl(path: Path) -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            stripped = line.strip()
-            if not stripped:
-                continue
-            items.append(json.loads(stripped))
-    return items
+    # One read plus a comprehension; json_loads accepts bytes.
+    return [json_loads(line) for line in path.read_bytes().splitlines() if line.strip()]
 
 
 def validate_truth_specs(cases: List[Dict[str, Any]]) -> None:
     answered = [case for case in cases if case.get("truth_spec")]
     if not answered:
         raise AssertionError("No answered cases produced.")
-    conn = duckdb.connect(str(DB_PATH), read_only=True)
-    try:
+    with warehouse.get_shared_connection(DB_PATH).cursor() as conn:
         for case in answered[:3]:
             spec = case["truth_spec"]
             series_id = spec["series_id"]
@@ -67,8 +67,6 @@ def validate_truth_specs(cases: List[Dict[str, Any]]) -> None:
                 raise AssertionError(f"Unsupported transform {transform}")
             if value is None:
                 raise AssertionError(f"Truth computation failed for case {case['id']}")
-    finally:
-        conn.close()
 
 
 def main() -> None:
@@ -78,34 +76,24 @@ def main() -> None:
         cases_path = tmp / "cases.jsonl"
         evalset_path = tmp / "evalset.jsonl"
 
-        run_script(
-            GOLDEN_SCRIPT,
-            "--per-series",
-            "2",
-            "--seed",
-            "777",
-            "--out",
-            str(golden_path),
+        # Run the pipeline stages in-process to avoid an interpreter start per stage.
+        generate_golden_from_duckdb.main(
+            ["--per-series", "2", "--seed", "777", "--out", str(golden_path)]
         )
-        run_script(
-            QUESTION_SCRIPT,
-            "--golden",
-            str(golden_path),
-            "--variants",
-            "1",
-            "--seed",
-            "777",
-            "--out",
-            str(cases_path),
+        generate_questions.main(
+            [
+                "--golden",
+                str(golden_path),
+                "--variants",
+                "1",
+                "--seed",
+                "777",
+                "--out",
+                str(cases_path),
+            ]
         )
-        run_script(
-            BUILD_SCRIPT,
-            "--cases",
-            str(cases_path),
-            "--refusals",
-            str(REFUSALS_PATH),
-            "--out",
-            str(evalset_path),
+        build_evalset.main(
+            ["--cases", str(cases_path), "--refusals", str(REFUSALS_PATH), "--out", str(evalset_path)]
         )
 
         eval_cases = load_jsonl(evalset_path)
@@ -34,30 +34,40 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--verifiers", type=Path, default=DEFAULT_VERIFIERS, help="Verifier map to use."
     )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Cases to run concurrently (default: 1)."
+    )
     return parser.parse_args()
 
 
+def _from_root(path: Path) -> Path:
+    """Resolve a relative CLI path against the repo root, independent of the caller's cwd."""
+    return path if path.is_absolute() else ROOT / path
+
+
 def main() -> None:
     args = parse_args()
     cmd = [
         sys.executable,
         str(MVES_RUN),
         "--golden",
-        str(args.golden),
+        str(_from_root(args.golden)),
         "--reports-dir",
-        str(args.reports_dir),
+        str(_from_root(args.reports_dir)),
         "--db",
-        str(args.db),
+        str(_from_root(args.db)),
         "--agent",
         args.agent,
         "--spec",
-        str(args.spec),
+        str(_from_root(args.spec)),
         "--verifiers",
-        str(args.verifiers),
+        str(_from_root(args.verifiers)),
         "--refusals",
-        args.refusals,
+        str(_from_root(Path(args.refusals))) if args.refusals.strip() else args.refusals,
+        "--workers",
+        str(args.workers),
     ]
-    subprocess.run(cmd, check=True, cwd=ROOT)
+    subprocess.run(cmd, check=True)
 
 
 if __name__ == "__main__":
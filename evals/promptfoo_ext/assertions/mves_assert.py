@@ -3,21 +3,64 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
 import json
 import math
+import os
+import queue
+import re
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-import duckdb  # type: ignore[import]
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 ROOT = Path(__file__).resolve().parents[3]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from src import truth  # noqa: E402
+from src import truth, warehouse  # noqa: E402
+from src.util import json_loads  # noqa: E402
 
 DB_PATH = ROOT / "data" / "warehouse.duckdb"
+DEFAULT_POOL_SIZE = 4
+
+
+def _pool_size() -> int:
+    # Read at import time, so a bad value must not stop every assertion from loading.
+    try:
+        return max(1, int(os.environ.get("MVES_DUCKDB_POOL", DEFAULT_POOL_SIZE)))
+    except ValueError:
+        return DEFAULT_POOL_SIZE
+
+
+POOL_SIZE = _pool_size()
+
+_CLARIFICATION_RE = re.compile(
+    r"provide|specify|missing|need|which series|more detail|clarify", re.IGNORECASE
+)
+
+# Ordered for stable error messages; the frozenset gives a one-call fast path when none are missing.
+_REQUIRED_FIELDS: Tuple[str, ...] = (
+    "question",
+    "series_id",
+    "transform",
+    "date",
+    "window",
+    "value",
+    "value_display",
+    "unit",
+    "answer",
+    "citations",
+    "confidence",
+    "errors",
+    "retrieved_docs",
+)
+_REQUIRED_FIELD_SET = frozenset(_REQUIRED_FIELDS)
+_DATE_TRANSFORMS = frozenset({"point", "yoy", "mom", "ma"})
+_WINDOW_TRANSFORMS = frozenset({"max", "min"})
+
+# Idle cursors over the shared read-only connection; concurrent assertions each get their own.
+_CURSOR_POOL: "queue.LifoQueue[Any]" = queue.LifoQueue(maxsize=POOL_SIZE)
 
 
 def get_assert(output: Any, context: Any) -> Dict[str, Any]:
@@ -45,7 +88,7 @@ def _evaluate_assertion(raw_output: Any, raw_context: Any) -> Dict[str, Any]:
     if error:
         return _build_result(False, error)
 
-    context, ctx_error = _coerce_json_object(raw_context, "Promptfoo context payload")
+    context, ctx_error = _coerce_json_object(raw_context, "Promptfoo context payload", cache=True)
     if ctx_error:
         return _build_result(False, ctx_error)
 
@@ -75,7 +118,9 @@ def _evaluate_assertion(raw_output: Any, raw_context: Any) -> Dict[str, Any]:
     return _build_result(passed, reason)
 
 
-def _coerce_json_object(payload: Any, label: str) -> tuple[Optional[Dict[str, Any]], Optional[str]]:
+def _coerce_json_object(
+    payload: Any, label: str, cache: bool = False
+) -> tuple[Optional[Dict[str, Any]], Optional[str]]:
     if isinstance(payload, dict):
         return payload, None
     if payload is None:
@@ -87,7 +132,7 @@ def _coerce_json_object(payload: Any, label: str) -> tuple[Optional[Dict[str, An
         if not text:
             return None, f"{label} was empty."
         try:
-            parsed = json.loads(text)
+            parsed = _loads_cached(text) if cache else json_loads(text)
         except json.JSONDecodeError as exc:
             return None, f"{label} was not valid JSON: {exc}"
         if not isinstance(parsed, dict):
@@ -96,26 +141,18 @@ def _coerce_json_object(payload: Any, label: str) -> tuple[Optional[Dict[str, An
     return None, f"{label} must be a JSON object or string."
 
 
+@functools.lru_cache(maxsize=1024)
+def _loads_cached(text: str) -> Any:
+    # Shared across calls for the same case; callers must not mutate the result.
+    return json_loads(text)
+
+
 def _validate_schema(response: Dict[str, Any]) -> List[str]:
     errors: List[str] = []
-    required_fields = [
-        "question",
-        "series_id",
-        "transform",
-        "date",
-        "window",
-        "value",
-        "value_display",
-        "unit",
-        "answer",
-        "citations",
-        "confidence",
-        "errors",
-        "retrieved_docs",
-    ]
-    for field in required_fields:
-        if field not in response:
-            errors.append(f"Missing required field '{field}'.")
+    if not _REQUIRED_FIELD_SET.issubset(response.keys()):
+        for field in _REQUIRED_FIELDS:
+            if field not in response:
+                errors.append(f"Missing required field '{field}'.")
 
     question = response.get("question")
     if not isinstance(question, str) or not question.strip():
@@ -125,17 +162,7 @@ def _validate_schema(response: Dict[str, Any]) -> List[str]:
     if not isinstance(answer, str) or not answer.strip():
         errors.append("Field 'answer' must be a non-empty string.")
 
-    transform = response.get("transform")
-    if transform is not None and not isinstance(transform, str):
-        errors.append("Field 'transform' must be a string when present.")
-
-    series_id = response.get("series_id")
-    if series_id is not None and not isinstance(series_id, str):
-        errors.append("Field 'series_id' must be a string or null.")
-
-    date = response.get("date")
-    if date is not None and not isinstance(date, str):
-        errors.append("Field 'date' must be a string or null.")
+    _apply_nullable_rules(response, _NULLABLE_ID_RULES, errors)
 
     window = response.get("window")
     if not isinstance(window, dict):
@@ -149,22 +176,18 @@ def _validate_schema(response: Dict[str, Any]) -> List[str]:
         if periods is not None and not isinstance(periods, int):
             errors.append("Window field 'periods' must be an integer or null.")
 
-    value = response.get("value")
-    if value is not None and not _is_number(value):
-        errors.append("Field 'value' must be numeric or null.")
-
-    value_display = response.get("value_display")
-    if value_display is not None and not isinstance(value_display, str):
-        errors.append("Field 'value_display' must be a string or null.")
-
-    unit = response.get("unit")
-    if unit is not None and not isinstance(unit, str):
-        errors.append("Field 'unit' must be a string or null.")
+    _apply_nullable_rules(response, _NULLABLE_VALUE_RULES, errors)
 
     citations = response.get("citations")
     if not isinstance(citations, list):
         errors.append("Field 'citations' must be a list.")
-    else:
+    elif not all(
+        isinstance(citation, dict)
+        and _is_str_or_none(citation.get("doc_id"))
+        and (citation.get("dates") is None or isinstance(citation.get("dates"), list))
+        for citation in citations
+    ):
+        # Only walk the list again to build ordered messages when something is wrong.
         for citation in citations:
             if not isinstance(citation, dict):
                 errors.append("Each citation must be an object.")
@@ -179,7 +202,7 @@ def _validate_schema(response: Dict[str, Any]) -> List[str]:
     retrieved = response.get("retrieved_docs")
     if not isinstance(retrieved, list):
         errors.append("Field 'retrieved_docs' must be a list.")
-    else:
+    elif not all(isinstance(doc, dict) and _is_str_or_none(doc.get("doc_id")) for doc in retrieved):
         for doc in retrieved:
             if not isinstance(doc, dict):
                 errors.append("Each retrieved doc must be an object.")
@@ -206,6 +229,15 @@ def _validate_schema(response: Dict[str, Any]) -> List[str]:
     return errors
 
 
+def _apply_nullable_rules(
+    response: Dict[str, Any], rules: Tuple["_NullableRule", ...], errors: List[str]
+) -> None:
+    for field, check, message in rules:
+        value = response.get(field)
+        if value is not None and not check(value):
+            errors.append(message)
+
+
 def _validate_refusal_payload(response: Dict[str, Any]) -> List[str]:
     errors: List[str] = []
     if response.get("value") is not None:
@@ -253,15 +285,15 @@ def _validate_answer_payload(response: Dict[str, Any], expect: Dict[str, Any]) -
         if display not in (response.get("answer") or ""):
             errors.append("value_display must appear verbatim in the answer text.")
 
+    expected_doc = f"series_{expected_series}"
     citations = response.get("citations") or []
     if not citations:
         errors.append("Answerable responses must include at least one citation.")
     else:
-        expected_doc = f"series_{expected_series}"
-        if not all(citation.get("doc_id") == expected_doc for citation in citations):
+        if any(citation.get("doc_id") != expected_doc for citation in citations):
             errors.append(f"All citations must reference '{expected_doc}'.")
-        doc_ids = {doc.get("doc_id") for doc in response.get("retrieved_docs", []) if doc.get("doc_id")}
-        if expected_doc not in doc_ids:
+        # Stop at the first matching doc instead of collecting every doc_id into a set.
+        if not any(doc.get("doc_id") == expected_doc for doc in response.get("retrieved_docs", [])):
             errors.append("Retrieved docs must include the cited series document.")
 
     confidence = response.get("confidence")
@@ -272,15 +304,12 @@ def _validate_answer_payload(response: Dict[str, Any], expect: Dict[str, Any]) -
         errors.append("Answerable responses must not include parse errors.")
 
     transform = transform or ""
-    if transform in {"point", "yoy", "mom", "ma"} and not response.get("date"):
+    if transform in _DATE_TRANSFORMS and not response.get("date"):
         errors.append(f"Transform '{transform}' requires a non-null date field.")
-    if transform == "ma":
-        window = response.get("window") or {}
-        periods = window.get("periods")
-        if not isinstance(periods, int):
-            errors.append("Moving average responses must include window.periods.")
-    if transform in {"max", "min"}:
-        window = response.get("window") or {}
+    window = response.get("window") or {}
+    if transform == "ma" and not isinstance(window.get("periods"), int):
+        errors.append("Moving average responses must include window.periods.")
+    if transform in _WINDOW_TRANSFORMS:
         if not window.get("start") or not window.get("end"):
             errors.append(f"Transform '{transform}' requires window start/end values.")
 
@@ -294,6 +323,23 @@ def _validate_truth(response: Dict[str, Any], truth_spec: Dict[str, Any]) -> Opt
 
     if not series_id or not transform:
         return "truth_spec must include series_id and transform."
+    # Checked up front: the fields key an lru_cache, and a hand-written spec with e.g. a list
+    # for periods would otherwise fail there as "unhashable type".
+    window = truth_spec.get("window") or {}
+    if not isinstance(series_id, str) or not isinstance(transform, str):
+        return "truth_spec series_id and transform must be strings."
+    if not isinstance(window, dict):
+        return "truth_spec.window must be an object."
+    for field, value in (
+        ("date", truth_spec.get("date")),
+        ("window.start", window.get("start")),
+        ("window.end", window.get("end")),
+    ):
+        if value is not None and not isinstance(value, str):
+            return f"truth_spec.{field} must be a string or null."
+    periods = truth_spec.get("periods")
+    if periods is not None and (not isinstance(periods, int) or isinstance(periods, bool)):
+        return "truth_spec.periods must be an integer or null."
 
     if response.get("value") is None:
         return "Cannot run truth check without a numeric value in the response."
@@ -304,8 +350,14 @@ def _validate_truth(response: Dict[str, Any], truth_spec: Dict[str, Any]) -> Opt
         return "Response value could not be converted to float."
 
     try:
-        with duckdb.connect(str(DB_PATH)) as con:
-            truth_value = _compute_truth(con, series_id, transform, truth_spec)
+        truth_value = _cached_truth(
+            series_id,
+            transform,
+            truth_spec.get("date"),
+            periods,
+            window.get("start"),
+            window.get("end"),
+        )
     except Exception as exc:  # pragma: no cover - defensive guard
         return f"Truth evaluation failed: {exc}"
 
@@ -320,45 +372,96 @@ def _validate_truth(response: Dict[str, Any], truth_spec: Dict[str, Any]) -> Opt
     return None
 
 
+@contextlib.contextmanager
+def _checkout() -> Iterator[Any]:
+    try:
+        con = _CURSOR_POOL.get_nowait()
+    except queue.Empty:
+        con = warehouse.get_shared_connection(DB_PATH).cursor()
+    try:
+        yield con
+    finally:
+        try:
+            _CURSOR_POOL.put_nowait(con)
+        except queue.Full:
+            con.close()
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_truth(
+    series_id: str,
+    transform: str,
+    date: Optional[str],
+    periods: Optional[int],
+    window_start: Optional[str],
+    window_end: Optional[str],
+) -> Optional[float]:
+    # The warehouse is a read-only snapshot, so truth values are stable for the process lifetime.
+    spec = {"date": date, "periods": periods, "window": {"start": window_start, "end": window_end}}
+    with _checkout() as con:
+        return _compute_truth(con, series_id, transform, spec)
+
+
 def _compute_truth(con, series_id: str, transform: str, spec: Dict[str, Any]) -> Optional[float]:
-    if transform == "point":
-        return truth.get_point(con, series_id, spec.get("date"))
-    if transform == "yoy":
-        return truth.get_yoy(con, series_id, spec.get("date"))
-    if transform == "mom":
-        return truth.get_mom(con, series_id, spec.get("date"))
-    if transform == "ma":
-        periods = spec.get("periods")
-        if periods is None:
-            raise ValueError("truth_spec.periods is required for moving averages.")
-        return truth.get_ma(con, series_id, spec.get("date"), periods)
-    if transform == "max":
-        window = spec.get("window") or {}
-        return truth.get_max(con, series_id, window.get("start"), window.get("end"))[1]
-    if transform == "min":
-        window = spec.get("window") or {}
-        return truth.get_min(con, series_id, window.get("start"), window.get("end"))[1]
-    raise ValueError(f"Unsupported transform '{transform}'.")
+    compute = _TRUTH_DISPATCH.get(transform)
+    if compute is None:
+        raise ValueError(f"Unsupported transform '{transform}'.")
+    return compute(con, series_id, spec)
+
+
+def _truth_ma(con, series_id: str, spec: Dict[str, Any]) -> Optional[float]:
+    periods = spec.get("periods")
+    if periods is None:
+        raise ValueError("truth_spec.periods is required for moving averages.")
+    return truth.get_ma(con, series_id, spec.get("date"), periods)
+
+
+def _window_bounds(spec: Dict[str, Any]) -> Tuple[Any, Any]:
+    window = spec.get("window") or {}
+    return window.get("start"), window.get("end")
+
+
+_TruthFn = Callable[[Any, str, Dict[str, Any]], Optional[float]]
+_TRUTH_DISPATCH: Dict[str, _TruthFn] = {
+    "point": lambda con, series_id, spec: truth.get_point(con, series_id, spec.get("date")),
+    "yoy": lambda con, series_id, spec: truth.get_yoy(con, series_id, spec.get("date")),
+    "mom": lambda con, series_id, spec: truth.get_mom(con, series_id, spec.get("date")),
+    "ma": _truth_ma,
+    "max": lambda con, series_id, spec: truth.get_max(con, series_id, *_window_bounds(spec))[1],
+    "min": lambda con, series_id, spec: truth.get_min(con, series_id, *_window_bounds(spec))[1],
+}
 
 
 def _looks_like_clarification(answer: str) -> bool:
-    lower = answer.lower()
-    keywords = [
-        "provide",
-        "specify",
-        "missing",
-        "need",
-        "which series",
-        "more detail",
-        "clarify",
-    ]
-    return any(keyword in lower for keyword in keywords)
+    return _CLARIFICATION_RE.search(answer) is not None
 
 
 def _is_number(value: Any) -> bool:
     return isinstance(value, (int, float)) and not isinstance(value, bool)
 
 
+def _is_str(value: Any) -> bool:
+    return isinstance(value, str)
+
+
+def _is_str_or_none(value: Any) -> bool:
+    return value is None or isinstance(value, str)
+
+
+# (field, type check, message) for optional fields that may be null; built once at import.
+_NullableRule = Tuple[str, Callable[[Any], bool], str]
+_NULLABLE_ID_RULES: Tuple[_NullableRule, ...] = (
+    ("transform", _is_str, "Field 'transform' must be a string when present."),
+    ("series_id", _is_str, "Field 'series_id' must be a string or null."),
+    ("date", _is_str, "Field 'date' must be a string or null."),
+)
+_NULLABLE_VALUE_RULES: Tuple[_NullableRule, ...] = (
+    ("value", _is_number, "Field 'value' must be numeric or null."),
+    ("value_display", _is_str, "Field 'value_display' must be a string or null."),
+    ("unit", _is_str, "Field 'unit' must be a string or null."),
+)
+
+
 def _build_result(passed: bool, reason: str) -> Dict[str, Any]:
     return {"pass": passed, "score": 1.0 if passed else 0.0, "reason": reason}
 
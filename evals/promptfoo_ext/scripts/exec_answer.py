@@ -3,61 +3,197 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import socket
 import subprocess
 import sys
-from datetime import datetime
+import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
+REPO_ROOT = Path(__file__).resolve().parents[3]
+ANSWER_SCRIPT = REPO_ROOT / "scripts" / "answer.py"
+PYTHON = sys.executable or "python3"
 LOG_PATH = Path(__file__).with_name("exec_answer.log")
+LOG_ENABLED = os.environ.get("EXEC_ANSWER_LOG", "1") != "0"
+WORKER_START_TIMEOUT_S = 30.0
+DEFAULT_WORKER_REQUEST_TIMEOUT_S = 300.0
+
+
+def _request_timeout() -> float:
+    try:
+        timeout = float(os.environ.get("MINIFRED_ANSWER_TIMEOUT", DEFAULT_WORKER_REQUEST_TIMEOUT_S))
+    except ValueError:
+        return DEFAULT_WORKER_REQUEST_TIMEOUT_S
+    # socket.settimeout rejects negatives, treats 0 as non-blocking, and overflows past ~1e9.
+    return timeout if 0 < timeout <= 86400 else DEFAULT_WORKER_REQUEST_TIMEOUT_S
+
+
+# A row the worker takes longer than this to answer is reported as failed, not retried.
+WORKER_REQUEST_TIMEOUT_S = _request_timeout()
+WORKER_TIMEOUT_RETURNCODE = 124
+# Code a worker imports once and then keeps serving; editing any of it starts a new worker.
+WORKER_CODE_DIRS = (REPO_ROOT / "rag_agent", REPO_ROOT / "src")
+
+
+def _open_log() -> Optional[int]:
+    try:
+        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        return os.open(LOG_PATH, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    except OSError:
+        return None
+
+
+# Opened once with O_APPEND so each entry lands as a single write, even with concurrent rows.
+_LOG_FD = _open_log() if LOG_ENABLED else None
 
 
 def main() -> int:
-    repo_root = Path(__file__).resolve().parents[3]
-    answer_script = repo_root / "scripts" / "answer.py"
-    if not answer_script.exists():
-        raise SystemExit(f"Expected answer.py at {answer_script}, but it was not found.")
+    if not ANSWER_SCRIPT.exists():
+        raise SystemExit(f"Expected answer.py at {ANSWER_SCRIPT}, but it was not found.")
 
-    cmd = [sys.executable or "python3", str(answer_script), *sys.argv[1:]]
+    cmd = [PYTHON, str(ANSWER_SCRIPT), *sys.argv[1:]]
     agent_override = os.environ.get("PROMPTFOO_AGENT")
     if agent_override:
         cmd.extend(["--agent", agent_override])
-    completed = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    completed = _run_via_worker(cmd)
+    via_worker = completed is not None
+    if completed is None:
+        if not LOG_ENABLED:
+            # Nothing to record, so let the child write straight to our stdout/stderr.
+            return subprocess.run(cmd, check=False).returncode
+        completed = subprocess.run(cmd, capture_output=True, check=False)
 
     _append_log(
         {
-            "ts": datetime.utcnow().isoformat() + "Z",
+            "ts_ns": time.time_ns(),
             "cwd": str(Path.cwd()),
             "python": sys.executable,
             "cmd": cmd,
+            "worker": via_worker,
             "returncode": completed.returncode,
-            "stdout": completed.stdout.strip(),
-            "stderr": completed.stderr.strip(),
+            "stdout": completed.stdout.decode("utf-8", "replace").strip(),
+            "stderr": completed.stderr.decode("utf-8", "replace").strip(),
         }
     )
 
     if completed.stdout:
-        sys.stdout.write(completed.stdout)
-        sys.stdout.flush()
+        sys.stdout.buffer.write(completed.stdout)
+        sys.stdout.buffer.flush()
     if completed.stderr:
-        sys.stderr.write(completed.stderr)
-        sys.stderr.flush()
+        sys.stderr.buffer.write(completed.stderr)
+        sys.stderr.buffer.flush()
     if completed.returncode != 0 and not completed.stderr:
         sys.stderr.write(
-            f"promptfoo exec wrapper: '{answer_script.name}' exited with code {completed.returncode}\n"
+            f"promptfoo exec wrapper: '{ANSWER_SCRIPT.name}' exited with code {completed.returncode}\n"
         )
         sys.stderr.flush()
 
     return completed.returncode
 
 
+def _run_via_worker(cmd: List[str]) -> Optional[subprocess.CompletedProcess]:
+    """Relay ``cmd`` to a persistent ``answer.py --server`` process, starting it if needed.
+
+    Returns ``None`` when the worker is disabled or unreachable so the caller can fall back
+    to a one-off subprocess.
+    """
+    if os.environ.get("MINIFRED_ANSWER_NO_WORKER") or not hasattr(socket, "AF_UNIX"):
+        return None
+    socket_path = _worker_socket_path()
+    request = json.dumps({"argv": cmd[2:]}).encode("utf-8") + b"\n"
+    try:
+        reply = _worker_request(socket_path, request)
+    except OSError:
+        subprocess.Popen(
+            [cmd[0], cmd[1], "--server", str(socket_path)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        reply = _wait_for_worker(socket_path, request)
+    if reply is None:
+        return None
+    return subprocess.CompletedProcess(
+        cmd, reply["returncode"], reply["stdout"].encode("utf-8"), reply["stderr"].encode("utf-8")
+    )
+
+
+def _valid_reply(reply: Any) -> bool:
+    return (
+        isinstance(reply, dict)
+        and isinstance(reply.get("returncode"), int)
+        and isinstance(reply.get("stdout"), str)
+        and isinstance(reply.get("stderr"), str)
+    )
+
+
+def _worker_socket_path() -> Path:
+    override = os.environ.get("MINIFRED_ANSWER_SOCKET")
+    if override:
+        return Path(override).expanduser()
+    # One worker per checkout and code version, so different trees never answer for each
+    # other and edited agent code is never served by a worker that imported the old code.
+    # Superseded workers exit on their own after their idle timeout.
+    digest = hashlib.sha1(str(REPO_ROOT).encode("utf-8"))
+    for path in (ANSWER_SCRIPT, *sorted(p for d in WORKER_CODE_DIRS for p in d.rglob("*.py"))):
+        try:
+            digest.update(f"{path}:{path.stat().st_mtime_ns}".encode("utf-8"))
+        except OSError:
+            continue
+    return Path.home() / ".cache" / "minifred" / f"answer-{digest.hexdigest()[:12]}.sock"
+
+
+def _worker_request(socket_path: Path, request: bytes) -> Optional[Dict[str, Any]]:
+    """Send one request and return the worker's reply.
+
+    Returns ``None`` when the request was not answered and can safely go to a fresh
+    subprocess (connect timed out, malformed or incompatible reply), and a failed reply
+    once the worker has taken the request but not answered in time, since retrying would
+    run the same slow row twice. Raises ``OSError`` if the worker is unreachable.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(WORKER_REQUEST_TIMEOUT_S)
+        try:
+            conn.connect(str(socket_path))
+        except socket.timeout:
+            return None
+        try:
+            with conn.makefile("rwb") as stream:
+                stream.write(request)
+                stream.flush()
+                line = stream.readline()
+        except socket.timeout:
+            return {
+                "returncode": WORKER_TIMEOUT_RETURNCODE,
+                "stdout": "",
+                "stderr": f"answer worker did not reply within {WORKER_REQUEST_TIMEOUT_S:g}s",
+            }
+    try:
+        reply = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return reply if _valid_reply(reply) else None
+
+
+def _wait_for_worker(socket_path: Path, request: bytes) -> Optional[Dict[str, Any]]:
+    deadline = time.monotonic() + WORKER_START_TIMEOUT_S
+    while time.monotonic() < deadline:
+        try:
+            return _worker_request(socket_path, request)
+        except OSError:
+            time.sleep(0.05)
+    return None
+
+
 def _append_log(entry: Dict[str, Any]) -> None:
+    if _LOG_FD is None:
+        return
     try:
-        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with LOG_PATH.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(entry) + "\n")
+        os.write(_LOG_FD, json.dumps(entry).encode("utf-8") + b"\n")
     except Exception:
         # Logging is best effort—never let it break the wrapper.
         pass
@@ -3,21 +3,15 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import re
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from functools import cached_property, lru_cache
+from datetime import date
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-try:
-    import duckdb  # type: ignore[import]
-except ModuleNotFoundError as exc:  # pragma: no cover
-    raise ImportError(
-        "duckdb is required to run MVES verifiers. Install it via `pip install duckdb`."
-    ) from exc
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
 import sys
-try:
-    import yaml  # type: ignore[import]
-except ModuleNotFoundError:  # pragma: no cover
-    yaml = None  # type: ignore[assignment]
 
 ROOT = Path(__file__).resolve().parents[1]
 
@@ -25,12 +19,13 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from src import truth  # noqa: E402
+from src.util import yaml_safe_load  # noqa: E402
 
 SPEC_PATH = Path("mves/spec.yaml")
 MAP_PATH = Path("mves/verifier_map.yaml")
 
 
-@dataclass
+@dataclass(slots=True)
 class Failure:
     verifier_id: str
     severity: str
@@ -38,89 +33,135 @@ class Failure:
 
 
 def load_spec() -> Dict[str, Any]:
-    text = SPEC_PATH.read_text(encoding="utf-8")
-    if yaml is not None:
-        return yaml.safe_load(text)
-    return json.loads(text)
+    """Return the parsed spec; cached per (path, mtime), so treat it as read-only."""
+    return _load_config(SPEC_PATH, SPEC_PATH.stat().st_mtime_ns)
 
 
 def load_verifier_map() -> List[Dict[str, Any]]:
-    text = MAP_PATH.read_text(encoding="utf-8")
-    if yaml is not None:
-        data = yaml.safe_load(text)
-    else:
-        data = json.loads(text)
-    return data.get("verifiers", [])
+    """Return the verifier entries; cached per (path, mtime), so treat them as read-only."""
+    return _load_config(MAP_PATH, MAP_PATH.stat().st_mtime_ns).get("verifiers", [])
+
+
+@lru_cache(maxsize=8)
+def _load_config(path: Path, mtime_ns: int) -> Any:
+    text = path.read_text(encoding="utf-8")
+    try:
+        return yaml_safe_load(text)
+    except ModuleNotFoundError:  # pragma: no cover - JSON configs work without PyYAML
+        return json.loads(text)
+
+
+def _warehouse():
+    """Import the DuckDB-backed warehouse on first truth lookup rather than at module import."""
+    try:
+        from src import warehouse
+    except ModuleNotFoundError as exc:  # pragma: no cover
+        raise ImportError(
+            "duckdb is required to run MVES verifiers. Install it via `pip install duckdb`."
+        ) from exc
+    return warehouse
+
+
+@lru_cache(maxsize=8)
+def _enabled_entries(path: Path, mtime_ns: int) -> Tuple[Dict[str, Any], ...]:
+    entries = _load_config(path, mtime_ns).get("verifiers", [])
+    return tuple(entry for entry in entries if entry.get("enabled", True))
 
 
 def verify_case(
-    case: Dict[str, Any], response: Dict[str, Any], db_path: Path
+    case: Dict[str, Any],
+    response: Dict[str, Any],
+    db_path: Path,
+    truth_cache: Optional[Mapping[TruthKey, Optional[float]]] = None,
 ) -> List[Failure]:
-    spec = load_spec()
-    verifier_map = load_verifier_map()
+    """Run the enabled verifiers; ``truth_cache`` comes from :func:`compute_truth_batch`."""
+    ctx = _VerifyContext(response, load_spec(), db_path, truth_cache)
+    verifier_map = _enabled_entries(MAP_PATH, MAP_PATH.stat().st_mtime_ns)
     failures: List[Failure] = []
 
-    registry = {
-        "schema_valid": lambda: _schema_valid(response, spec),
-        "no_hallucination_on_error": lambda: _no_hallucination_on_error(response),
-        "citations_present_when_value": lambda: _citations_present_when_value(response),
-        "citations_match_series_id": lambda: _citations_match_series_id(response),
-        "citations_subset_of_retrieved": lambda: _citations_subset_of_retrieved(response),
-        "window_rules": lambda: _window_rules(response),
-        "date_rules": lambda: _date_rules(case, response),
-        "confidence_rules": lambda: _confidence_rules(response),
-        "no_urls_in_answer": lambda: _no_urls_in_answer(response),
-        "value_display_in_answer": lambda: _value_display_in_answer(response),
-        "expectation_transform": lambda: _expectation_transform(case, response),
-        "expectation_value_presence": lambda: _expectation_value_presence(case, response),
-        "truth_matches": lambda: _truth_matches(case, response, db_path),
-    }
-
     for entry in verifier_map:
-        if not entry.get("enabled", True):
-            continue
         if not _entry_applicable(entry, case):
             continue
         verifier_id = entry["id"]
         severity = entry["severity"]
-        fn = registry.get(verifier_id)
+        fn = _REGISTRY.get(verifier_id)
         if not fn:
             continue
-        messages = fn()
-        for message in messages:
-            failures.append(Failure(verifier_id, severity, message))
+        failures.extend(
+            Failure(verifier_id, severity, message)
+            for message in fn(case, response, ctx)
+        )
 
     return failures
 
 
+@dataclass
+class _VerifyContext:
+    """Per-response inputs shared by the verifiers; derived lookups are built on first use."""
+
+    response: Dict[str, Any]
+    spec: Dict[str, Any]
+    db_path: Path
+    truth_cache: Optional[Mapping[TruthKey, Optional[float]]]
+
+    @cached_property
+    def retrieved_ids(self) -> FrozenSet[Any]:
+        return frozenset(doc.get("doc_id") for doc in self.response.get("retrieved_docs", []))
+
+
+# Verifier id -> check called as fn(case, response, ctx); built once at import.
+_VerifierFn = Callable[[Dict[str, Any], Dict[str, Any], _VerifyContext], List[str]]
+_REGISTRY: Dict[str, _VerifierFn] = {
+    "schema_valid": lambda c, r, ctx: _schema_valid(r, ctx.spec),
+    "no_hallucination_on_error": lambda c, r, ctx: _no_hallucination_on_error(r),
+    "citations_present_when_value": lambda c, r, ctx: _citations_present_when_value(r),
+    "citations_match_series_id": lambda c, r, ctx: _citations_match_series_id(r),
+    "citations_subset_of_retrieved": lambda c, r, ctx: _citations_subset_of_retrieved(r, ctx),
+    "window_rules": lambda c, r, ctx: _window_rules(r),
+    "date_rules": lambda c, r, ctx: _date_rules(c, r),
+    "confidence_rules": lambda c, r, ctx: _confidence_rules(r),
+    "no_urls_in_answer": lambda c, r, ctx: _no_urls_in_answer(r),
+    "value_display_in_answer": lambda c, r, ctx: _value_display_in_answer(r),
+    "expectation_transform": lambda c, r, ctx: _expectation_transform(c, r),
+    "expectation_value_presence": lambda c, r, ctx: _expectation_value_presence(c, r, ctx),
+    "truth_matches": lambda c, r, ctx: _truth_matches(c, r, ctx.db_path, ctx.truth_cache),
+}
+
+
+_REQUIRED_FIELDS: Tuple[str, ...] = (
+    "question",
+    "series_id",
+    "transform",
+    "date",
+    "window",
+    "value",
+    "unit",
+    "answer",
+    "citations",
+    "confidence",
+    "errors",
+    "retrieved_docs",
+)
+_REQUIRED_FIELD_SET = frozenset(_REQUIRED_FIELDS)
+_WINDOW_FIELDS: Tuple[str, ...] = ("start", "end", "periods")
+
+
 def _schema_valid(response: Dict[str, Any], spec: Dict[str, Any]) -> List[str]:
     messages: List[str] = []
-    required = [
-        "question",
-        "series_id",
-        "transform",
-        "date",
-        "window",
-        "value",
-        "unit",
-        "answer",
-        "citations",
-        "confidence",
-        "errors",
-        "retrieved_docs",
-    ]
-    for key in required:
-        if key not in response:
-            messages.append(f"Missing required field '{key}'.")
+    if not _REQUIRED_FIELD_SET.issubset(response.keys()):
+        for key in _REQUIRED_FIELDS:
+            if key not in response:
+                messages.append(f"Missing required field '{key}'.")
     window = response.get("window")
     if not isinstance(window, dict):
         messages.append("window must be an object.")
     else:
-        for key in ("start", "end", "periods"):
+        for key in _WINDOW_FIELDS:
             if key not in window:
                 messages.append(f"window missing '{key}'.")
-    if response.get("transform") not in spec.get("transforms", []):
-        messages.append(f"Unsupported transform '{response.get('transform')}'.")
+    transform = response.get("transform")
+    if transform not in spec.get("transforms", []):
+        messages.append(f"Unsupported transform '{transform}'.")
     if not isinstance(response.get("citations"), list):
         messages.append("citations must be a list.")
     if not isinstance(response.get("retrieved_docs"), list):
@@ -166,21 +207,20 @@ def _citations_match_series_id(response: Dict[str, Any]) -> List[str]:
     if series_id:
         expected = f"series_{series_id}"
         for citation in citations:
-            if citation.get("doc_id") != expected:
-                messages.append(
-                    f"Citation doc_id {citation.get('doc_id')} does not match {expected}."
-                )
+            doc_id = citation.get("doc_id")
+            if doc_id != expected:
+                messages.append(f"Citation doc_id {doc_id} does not match {expected}.")
     return messages
 
 
-def _citations_subset_of_retrieved(response: Dict[str, Any]) -> List[str]:
-    messages: List[str] = []
-    retrieved = {doc.get("doc_id") for doc in response.get("retrieved_docs", [])}
-    for citation in response.get("citations", []):
-        doc_id = citation.get("doc_id")
-        if doc_id and doc_id not in retrieved:
-            messages.append(f"Citation doc_id {doc_id} missing from retrieved_docs.")
-    return messages
+def _citations_subset_of_retrieved(response: Dict[str, Any], ctx: _VerifyContext) -> List[str]:
+    retrieved = ctx.retrieved_ids
+    doc_ids = (citation.get("doc_id") for citation in response.get("citations", []))
+    return [
+        f"Citation doc_id {doc_id} missing from retrieved_docs."
+        for doc_id in doc_ids
+        if doc_id and doc_id not in retrieved
+    ]
 
 
 def _window_rules(response: Dict[str, Any]) -> List[str]:
@@ -254,7 +294,7 @@ def _expectation_transform(case: Dict[str, Any], response: Dict[str, Any]) -> Li
 
 
 def _expectation_value_presence(
-    case: Dict[str, Any], response: Dict[str, Any]
+    case: Dict[str, Any], response: Dict[str, Any], ctx: _VerifyContext
 ) -> List[str]:
     expect = case.get("expect", {})
     should_answer = expect.get("should_answer", True)
@@ -275,23 +315,27 @@ def _expectation_value_presence(
     if not should_answer and not response.get("errors"):
         messages.append("Expected refusal/clarification, but errors list is empty.")
 
-    if require_citation and not response.get("citations"):
+    citations = response.get("citations")
+    if require_citation and not citations:
         messages.append("Expected citations but none were returned.")
 
-    if require_retrieved and response.get("citations"):
-        retrieved = {doc.get("doc_id") for doc in response.get("retrieved_docs", [])}
-        for citation in response.get("citations", []):
-            doc_id = citation.get("doc_id")
-            if doc_id not in retrieved:
-                messages.append(
-                    f"Citation {doc_id} missing from retrieved docs for required match."
-                )
+    if require_retrieved and citations:
+        retrieved = ctx.retrieved_ids
+        doc_ids = (citation.get("doc_id") for citation in citations)
+        messages.extend(
+            f"Citation {doc_id} missing from retrieved docs for required match."
+            for doc_id in doc_ids
+            if doc_id not in retrieved
+        )
 
     return messages
 
 
 def _truth_matches(
-    case: Dict[str, Any], response: Dict[str, Any], db_path: Path
+    case: Dict[str, Any],
+    response: Dict[str, Any],
+    db_path: Path,
+    truth_cache: Optional[Mapping[TruthKey, Optional[float]]] = None,
 ) -> List[str]:
     messages: List[str] = []
     expect = case.get("expect", {})
@@ -301,7 +345,11 @@ def _truth_matches(
     if not truth_spec:
         return messages
 
-    expected_value = _compute_truth(db_path, truth_spec)
+    key = truth_key(truth_spec) if truth_cache else None
+    if key is not None and key in truth_cache:
+        expected_value = truth_cache[key]
+    else:
+        expected_value = _compute_truth(db_path, truth_spec)
     if expected_value is None:
         messages.append("Unable to compute truth value for truth_spec.")
         return messages
@@ -320,8 +368,8 @@ def _truth_matches(
 
 
 def _compute_truth(db_path: Path, spec: Dict[str, Any]) -> Optional[float]:
-    conn = duckdb.connect(str(db_path), read_only=True)
-    try:
+    # Cursor over the process-wide read-only connection; closing it leaves the connection open.
+    with _warehouse().get_shared_connection(db_path).cursor() as conn:
         series_id = spec["series_id"]
         transform = spec["transform"]
         if transform == "point":
@@ -339,8 +387,178 @@ def _compute_truth(db_path: Path, spec: Dict[str, Any]) -> Optional[float]:
             _, value = truth.get_min(conn, series_id, spec["window"]["start"], spec["window"]["end"])
             return value
         return None
-    finally:
-        conn.close()
+
+
+TruthKey = Tuple[Any, ...]
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def truth_key(spec: Any) -> Optional[TruthKey]:
+    """Return a hashable key covering every truth_spec field used by the truth computation."""
+    if not isinstance(spec, dict):
+        return None
+    window = spec.get("window")
+    if window is not None and not isinstance(window, dict):
+        return None
+    window = window or {}
+    key = (
+        spec.get("series_id"),
+        spec.get("transform"),
+        spec.get("date"),
+        spec.get("periods"),
+        window.get("start"),
+        window.get("end"),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def compute_truth_batch(db_path: Path, specs: Iterable[Any]) -> Dict[TruthKey, Optional[float]]:
+    """Compute truth values for many truth_specs with one query per transform family.
+
+    Only well-formed specs with ISO dates are batched; anything else (or a family whose query
+    fails) is left out of the result so ``verify_case`` computes it individually, as before.
+    """
+    changes: Dict[TruthKey, Tuple[str, str, str]] = {}
+    moving: Dict[TruthKey, Tuple[str, str, int]] = {}
+    extrema: Dict[TruthKey, Tuple[str, str, str, str]] = {}
+    for spec in specs:
+        key = truth_key(spec)
+        if key is None:
+            continue
+        series_id, transform, target, periods, start, end = key
+        if not isinstance(series_id, str):
+            continue
+        if transform in ("point", "yoy", "mom") and _is_iso_date(target):
+            changes[key] = (series_id, transform, target)
+        elif transform == "ma" and _is_iso_date(target) and type(periods) is int and periods > 0:
+            moving[key] = (series_id, target, periods)
+        elif transform in ("max", "min") and _is_iso_date(start) and _is_iso_date(end):
+            start, end = (start, end) if start <= end else (end, start)
+            extrema[key] = (series_id, transform, start, end)
+
+    results: Dict[TruthKey, Optional[float]] = {}
+    if not (changes or moving or extrema):
+        return results
+    warehouse = _warehouse()
+    with warehouse.get_shared_connection(db_path).cursor() as conn:
+        for batch, wanted in ((_batch_changes, changes), (_batch_ma, moving), (_batch_extrema, extrema)):
+            if not wanted:
+                continue
+            try:
+                results.update(batch(conn, wanted))
+            except warehouse.duckdb.Error:
+                continue
+    return results
+
+
+def _is_iso_date(value: Any) -> bool:
+    if not isinstance(value, str) or not _ISO_DATE.fullmatch(value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _batch_changes(conn, wanted: Dict[TruthKey, Tuple[str, str, str]]) -> Dict[TruthKey, Optional[float]]:
+    bases: Dict[TruthKey, str] = {}
+    for key, (series_id, transform, target) in wanted.items():
+        if transform == "yoy":
+            bases[key] = truth.shift_for_yoy(target, truth.get_frequency(conn, series_id))
+        elif transform == "mom":
+            bases[key] = truth.shift_for_mom(target, truth.get_frequency(conn, series_id))
+    pairs = {(series_id, target) for series_id, _, target in wanted.values()}
+    pairs.update((wanted[key][0], base) for key, base in bases.items())
+    params: List[str] = []
+    for series_id, day in pairs:
+        params.extend((series_id, day))
+    placeholders = ", ".join(["(?, CAST(? AS DATE))"] * len(pairs))
+    rows = conn.execute(
+        f"""
+        SELECT q.series_id, CAST(q.day AS VARCHAR), o.value
+        FROM (VALUES {placeholders}) AS q(series_id, day)
+        JOIN observations AS o ON o.series_id = q.series_id AND o.date = q.day
+        """,
+        params,
+    ).fetchall()
+    values = {(series_id, day): value for series_id, day, value in rows}
+
+    def point(series_id: str, day: str) -> Optional[float]:
+        value = values.get((series_id, day))
+        return float(value) if value is not None else None
+
+    results: Dict[TruthKey, Optional[float]] = {}
+    for key, (series_id, transform, target) in wanted.items():
+        current = point(series_id, target)
+        if transform == "point" or current is None:
+            results[key] = current
+        else:
+            results[key] = truth.percent_change(current, point(series_id, bases[key]))
+    return results
+
+
+def _batch_ma(conn, wanted: Dict[TruthKey, Tuple[str, str, int]]) -> Dict[TruthKey, Optional[float]]:
+    keys = list(wanted)
+    params: List[Any] = []
+    for index, key in enumerate(keys):
+        params.extend((index, *wanted[key]))
+    placeholders = ", ".join(["(?, ?, CAST(? AS DATE), ?)"] * len(keys))
+    rows = conn.execute(
+        f"""
+        SELECT q.idx, o.date, o.value
+        FROM (VALUES {placeholders}) AS q(idx, series_id, day, periods)
+        JOIN observations AS o ON o.series_id = q.series_id AND o.date <= q.day
+        QUALIFY row_number() OVER (PARTITION BY q.idx ORDER BY o.date DESC) <= q.periods
+        """,
+        params,
+    ).fetchall()
+    windows: Dict[int, List[Tuple[Any, Optional[float]]]] = defaultdict(list)
+    for index, day, value in rows:
+        windows[index].append((day, value))
+
+    results: Dict[TruthKey, Optional[float]] = {}
+    for index, key in enumerate(keys):
+        periods = wanted[key][2]
+        # Oldest -> newest, summed in the same order as truth.get_ma.
+        values = [value for _, value in sorted(windows.get(index, ())) if value is not None]
+        results[key] = float(sum(values) / periods) if len(values) == periods else None
+    return results
+
+
+def _batch_extrema(
+    conn, wanted: Dict[TruthKey, Tuple[str, str, str, str]]
+) -> Dict[TruthKey, Optional[float]]:
+    keys = list(wanted)
+    params: List[Any] = []
+    for index, key in enumerate(keys):
+        series_id, _, start, end = wanted[key]
+        params.extend((index, series_id, start, end))
+    placeholders = ", ".join(["(?, ?, CAST(? AS DATE), CAST(? AS DATE))"] * len(keys))
+    rows = conn.execute(
+        f"""
+        SELECT q.idx, max(o.value), min(o.value)
+        FROM (VALUES {placeholders}) AS q(idx, series_id, start_day, end_day)
+        JOIN observations AS o
+          ON o.series_id = q.series_id
+         AND o.date BETWEEN q.start_day AND q.end_day
+         AND o.value IS NOT NULL
+        GROUP BY q.idx
+        """,
+        params,
+    ).fetchall()
+    found = {index: (high, low) for index, high, low in rows}
+
+    results: Dict[TruthKey, Optional[float]] = {}
+    for index, key in enumerate(keys):
+        high, low = found.get(index, (None, None))
+        value = high if wanted[key][1] == "max" else low
+        results[key] = float(value) if value is not None else None
+    return results
 
 
 def _entry_applicable(entry: Dict[str, Any], case: Dict[str, Any]) -> bool:
@@ -353,4 +571,4 @@ def _entry_applicable(entry: Dict[str, Any], case: Dict[str, Any]) -> bool:
 
 
 def dump_failures_json(failures: List[Failure]) -> str:
-    return json.dumps([failure.__dict__ for failure in failures], indent=2)
+    return json.dumps([asdict(failure) for failure in failures], indent=2)
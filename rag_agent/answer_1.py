@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import re
 from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -16,7 +17,7 @@ if str(ROOT) not in sys.path:
 
 from src import warehouse  # noqa: E402
 from src.parse import MISSING_SERIES_ERROR, parse_question  # noqa: E402
-from src.retriever import TfidfRetriever  # noqa: E402
+from src.retriever import get_retriever  # noqa: E402
 from src.truth import (  # noqa: E402
     get_ma,
     get_max,
@@ -27,6 +28,25 @@ from src.truth import (  # noqa: E402
 )
 from src.util import load_series_config  # noqa: E402
 
+MONTH_NAMES = (
+    "",
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+URL_PATTERN = re.compile(r"https?://\S+")
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s+")
+YEAR_RANGE_PATTERN = re.compile(r"\b\d{4}\s*-\s*\d{4}\b")
+
 
 def run(
     question: str,
@@ -38,8 +58,7 @@ def run(
     _ensure_cards_dir(cards_dir)
     load_series_config(config_path)  # validates file exists
 
-    retriever = TfidfRetriever(cards_dir)
-    retriever.build()
+    retriever = get_retriever(cards_dir)
 
     retrieved = retriever.retrieve(question, k=3)
     retrieved_summary = [
@@ -49,17 +68,18 @@ def run(
     parsed = parse_question(question)
     parsed = _maybe_infer_series_from_retrieval(parsed, retrieved)
 
-    con = warehouse.get_connection(db_path, read_only=True, retries=3)
+    con = warehouse.get_shared_connection(db_path).cursor()
 
     if parsed.missing_series and (parsed.series_id is None):
         return _clarifying_response(parsed, retrieved_summary)
 
-    return _build_response(parsed, con, cards_dir, retrieved_summary)
+    return _build_response(parsed, con, db_path, cards_dir, retrieved_summary)
 
 
 def _build_response(
     parsed,
     con,
+    db_path: Path,
     cards_dir: Path,
     retrieved_docs: List[Dict[str, object]],
 ) -> Dict[str, object]:
@@ -86,7 +106,7 @@ def _build_response(
         base["answer"] = " ".join(parsed.errors)
         return base
 
-    metadata = _fetch_metadata(con, parsed.series_id)
+    metadata = _fetch_metadata(db_path, parsed.series_id)
     if not metadata:
         base["errors"].append(f"Series {parsed.series_id} not found in warehouse.")
         base["answer"] = base["errors"][0]
@@ -119,7 +139,6 @@ def _build_response(
 
     base["value"] = value
     base["answer"] = answer_text
-    citation_dates = [_date_to_str(d) for d in citation_dates]
     base["citations"] = [
         {
             "doc_id": primary_doc_id,
@@ -190,7 +209,8 @@ def _compute_answer(parsed, con, metadata: Dict[str, object]):
     if value is None or not answer_text:
         return None, citation_dates, None
 
-    citation_dates = [d for d in citation_dates if d]
+    # Every branch above only appends truthy dates.
+    citation_dates = [_date_to_str(d) for d in citation_dates]
     return value, citation_dates, answer_text
 
 
@@ -248,18 +268,25 @@ def _format_value(value: float, units: Optional[str], percent_hint: bool) -> str
 def _humanize_date(date_str: str) -> str:
     if date_str is None:
         return "N/A"
-    if isinstance(date_str, datetime):
-        dt = date_str
-    elif isinstance(date_str, date):
-        dt = datetime.combine(date_str, datetime.min.time())
-    else:
-        try:
-            dt = datetime.fromisoformat(str(date_str))
-        except ValueError:
-            return str(date_str)
+    if isinstance(date_str, date):  # includes datetime
+        return _format_humanized(date_str)
+    return _humanize_iso(str(date_str))
+
+
+@lru_cache(maxsize=2048)
+def _humanize_iso(value: str) -> str:
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    return _format_humanized(dt)
+
+
+def _format_humanized(dt: date) -> str:
+    month = MONTH_NAMES[dt.month]
     if dt.day == 1:
-        return dt.strftime("%B %Y")
-    return dt.strftime("%B %d, %Y").replace(" 0", " ")
+        return f"{month} {dt.year}"
+    return f"{month} {dt.day}, {dt.year}"
 
 
 def _ensure_cards_dir(path: Path) -> None:
@@ -269,17 +296,24 @@ def _ensure_cards_dir(path: Path) -> None:
         )
 
 
-def _fetch_metadata(con, series_id: Optional[str]) -> Optional[Dict[str, object]]:
+def _fetch_metadata(db_path: Path, series_id: Optional[str]) -> Optional[Dict[str, object]]:
     if not series_id:
         return None
-    row = con.execute(
-        """
-        SELECT series_id, title, units
-        FROM series
-        WHERE series_id = ?
-        """,
-        [series_id],
-    ).fetchone()
+    metadata = _cached_metadata(str(Path(db_path).expanduser().resolve()), series_id)
+    return dict(metadata) if metadata else None
+
+
+@lru_cache(maxsize=256)
+def _cached_metadata(db_key: str, series_id: str) -> Optional[Dict[str, object]]:
+    with warehouse.get_shared_connection(db_key).cursor() as con:
+        row = con.execute(
+            """
+            SELECT series_id, title, units
+            FROM series
+            WHERE series_id = ?
+            """,
+            [series_id],
+        ).fetchone()
     if not row:
         return None
     return {"series_id": row[0], "title": row[1], "units": row[2]}
@@ -326,7 +360,12 @@ def _clarifying_response(parsed, retrieved_docs: List[Dict[str, object]]) -> Dic
 
 
 def _definition_snippet(card_path: Path, max_chars: int = 200) -> Optional[str]:
-    text = card_path.read_text(encoding="utf-8")
+    return _cached_definition_snippet(str(card_path), card_path.stat().st_mtime_ns, max_chars)
+
+
+@lru_cache(maxsize=256)
+def _cached_definition_snippet(card_path_str: str, mtime_ns: int, max_chars: int) -> Optional[str]:
+    text = Path(card_path_str).read_text(encoding="utf-8")
     marker = "## Definition"
     if marker not in text:
         return None
@@ -334,10 +373,10 @@ def _definition_snippet(card_path: Path, max_chars: int = 200) -> Optional[str]:
     if "## " in after:
         after = after.split("## ", 1)[0]
     cleaned = " ".join(line.strip() for line in after.splitlines() if line.strip())
-    cleaned = re.sub(r"https?://\S+", "", cleaned)
+    cleaned = URL_PATTERN.sub("", cleaned)
     if not cleaned:
         return None
-    sentences = re.split(r"(?<=[.!?])\s+", cleaned)
+    sentences = SENTENCE_SPLIT_PATTERN.split(cleaned)
     sentence = ""
     for candidate in sentences:
         candidate = candidate.strip()
@@ -345,7 +384,7 @@ def _definition_snippet(card_path: Path, max_chars: int = 200) -> Optional[str]:
             continue
         if len(candidate.split()) < 6:
             continue
-        if re.search(r"\b\d{4}\s*-\s*\d{4}\b", candidate):
+        if YEAR_RANGE_PATTERN.search(candidate):
             continue
         sentence = candidate
         break
@@ -371,10 +410,9 @@ def _series_id_from_doc(doc_id: str) -> str:
 
 
 def _date_to_str(value):
-    if value is None:
-        return None
-    if isinstance(value, datetime):
-        return value.isoformat()
-    if isinstance(value, date):
+    # Parsed dates are usually ISO strings already.
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, date):  # includes datetime
         return value.isoformat()
     return str(value)
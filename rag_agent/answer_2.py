@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import re
 from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Sequence
 
@@ -15,7 +16,7 @@ if str(ROOT) not in sys.path:
 
 from src import warehouse  # noqa: E402
 from src.parse import MISSING_SERIES_ERROR, parse_question  # noqa: E402
-from src.retriever import TfidfRetriever  # noqa: E402
+from src.retriever import get_retriever  # noqa: E402
 from src.truth import (  # noqa: E402
     get_ma,
     get_max,
@@ -53,6 +54,40 @@ MONTHS = {
     "dec": 12,
 }
 
+MA_WORD_PATTERN = re.compile(r"\bma\b")
+PERIODS_PATTERN = re.compile(r"(\d+)\s*[- ]?\s*(?:periods?|months?)\s+(?:moving average|ma)")
+WINDOW_PATTERN = re.compile(
+    r"(?:between|from)\s+(?P<start>[A-Za-z0-9\s\-/]+?)\s+(?:and|to)\s+(?P<end>[A-Za-z0-9\s\-/]+)",
+    re.IGNORECASE,
+)
+# Every single-date form in one scan; _extract_single_date applies the
+# priority between them.  The month-year branch only consumes the month
+# word, so a year-month token right after it stays visible to the scan.
+SINGLE_DATE_PATTERN = re.compile(
+    r"\b(?:(?P<iso>\d{4}-\d{2}-\d{2})\b"
+    r"|(?P<ymonth>\d{4}-\d{2})\b"
+    r"|(?P<month>[A-Za-z]+\s+)(?=(?P<year>\d{4})\b))"
+)
+YEAR_MONTH_TOKEN_PATTERN = re.compile(r"\d{4}-\d{2}")
+MONTH_NAMES = (
+    "",
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+URL_PATTERN = re.compile(r"https?://\S+")
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s+")
+YEAR_RANGE_PATTERN = re.compile(r"\b\d{4}\s*-\s*\d{4}\b")
+
 
 def run(
     question: str,
@@ -64,8 +99,7 @@ def run(
     _ensure_cards_dir(cards_dir)
     load_series_config(config_path)
 
-    retriever = TfidfRetriever(cards_dir)
-    retriever.build()
+    retriever = get_retriever(cards_dir)
 
     retrieved = retriever.retrieve(question, k=3)
     retrieved_summary = [
@@ -76,12 +110,12 @@ def run(
     parsed = _refine_parsed_result(parsed, question)
     parsed = _maybe_infer_series_from_retrieval(parsed, retrieved)
 
-    con = warehouse.get_connection(db_path, read_only=True, retries=3)
+    con = warehouse.get_shared_connection(db_path).cursor()
 
     if parsed.missing_series and (parsed.series_id is None):
         return _clarifying_response(parsed, retrieved_summary)
 
-    return _build_response(parsed, con, cards_dir, retrieved_summary)
+    return _build_response(parsed, con, db_path, cards_dir, retrieved_summary)
 
 
 def _refine_parsed_result(parsed, question: str):
@@ -118,27 +152,20 @@ def _detect_transform(text: str) -> Optional[str]:
         return "yoy"
     if any(phrase in text for phrase in ["month-over-month", "month over month", "mom"]):
         return "mom"
-    if "moving average" in text or re.search(r"\bma\b", text):
+    if "moving average" in text or MA_WORD_PATTERN.search(text):
         return "ma"
     return None
 
 
 def _extract_periods(text: str) -> Optional[int]:
-    match = re.search(
-        r"(\d+)\s*[- ]?\s*(?:periods?|months?)\s+(?:moving average|ma)",
-        text,
-    )
+    match = PERIODS_PATTERN.search(text)
     if match:
         return int(match.group(1))
     return None
 
 
 def _extract_window(question: str) -> Sequence[Optional[str]]:
-    pattern = re.compile(
-        r"(?:between|from)\s+(?P<start>[A-Za-z0-9\s\-/]+?)\s+(?:and|to)\s+(?P<end>[A-Za-z0-9\s\-/]+)",
-        re.IGNORECASE,
-    )
-    match = pattern.search(question)
+    match = WINDOW_PATTERN.search(question)
     if not match:
         return (None, None)
     start = _parse_date_token(match.group("start"))
@@ -147,16 +174,18 @@ def _extract_window(question: str) -> Sequence[Optional[str]]:
 
 
 def _extract_single_date(question: str) -> Optional[str]:
-    iso_date = re.search(r"\b\d{4}-\d{2}-\d{2}\b", question)
-    if iso_date:
-        return iso_date.group(0)
-    iso_month = re.search(r"\b\d{4}-\d{2}\b", question)
+    first: Dict[str, re.Match] = {}
+    for match in SINGLE_DATE_PATTERN.finditer(question):
+        kind = match.lastgroup
+        if kind == "iso":
+            return match.group(0)
+        first.setdefault(kind, match)
+    iso_month = first.get("ymonth")
     if iso_month:
         return f"{iso_month.group(0)}-01"
-    month_year = re.search(r"\b([A-Za-z]+)\s+(\d{4})\b", question)
+    month_year = first.get("year")
     if month_year:
-        token = month_year.group(0)
-        parsed = _parse_date_token(token)
+        parsed = _parse_date_token(month_year.group("month") + month_year.group("year"))
         if parsed:
             return parsed
     return None
@@ -164,12 +193,13 @@ def _extract_single_date(question: str) -> Optional[str]:
 
 def _parse_date_token(token: str) -> Optional[str]:
     clean = token.strip().strip(".,;:?!")
-    try:
-        return datetime.fromisoformat(clean).date().isoformat()
-    except ValueError:
-        pass
-    if re.fullmatch(r"\d{4}-\d{2}", clean):
+    if YEAR_MONTH_TOKEN_PATTERN.fullmatch(clean):
         return f"{clean}-01"
+    if len(clean) >= 7 and clean[:4].isdigit():
+        try:
+            return datetime.fromisoformat(clean).date().isoformat()
+        except ValueError:
+            pass
     parts = clean.split()
     if len(parts) == 2:
         month = MONTHS.get(parts[0].lower())
@@ -180,6 +210,9 @@ def _parse_date_token(token: str) -> Optional[str]:
 
 
 def _safe_int(value: str) -> Optional[int]:
+    if value.isdecimal():
+        return int(value)
+    # int() also takes signs, underscores and surrounding whitespace.
     try:
         return int(value)
     except ValueError:
@@ -189,6 +222,7 @@ def _safe_int(value: str) -> Optional[int]:
 def _build_response(
     parsed,
     con,
+    db_path: Path,
     cards_dir: Path,
     retrieved_docs: List[Dict[str, object]],
 ) -> Dict[str, object]:
@@ -215,7 +249,7 @@ def _build_response(
         base["answer"] = " ".join(parsed.errors)
         return base
 
-    metadata = _fetch_metadata(con, parsed.series_id)
+    metadata = _fetch_metadata(db_path, parsed.series_id)
     if not metadata:
         base["errors"].append(f"Series {parsed.series_id} not found in warehouse.")
         base["answer"] = base["errors"][0]
@@ -248,7 +282,6 @@ def _build_response(
 
     base["value"] = value
     base["answer"] = answer_text
-    citation_dates = [_date_to_str(d) for d in citation_dates]
     base["citations"] = [
         {
             "doc_id": primary_doc_id,
@@ -319,7 +352,8 @@ def _compute_answer(parsed, con, metadata: Dict[str, object]):
     if value is None or not answer_text:
         return None, citation_dates, None
 
-    citation_dates = [d for d in citation_dates if d]
+    # Every branch above only appends truthy dates.
+    citation_dates = [_date_to_str(d) for d in citation_dates]
     return value, citation_dates, answer_text
 
 
@@ -377,18 +411,25 @@ def _format_value(value: float, units: Optional[str], percent_hint: bool) -> str
 def _humanize_date(date_str: str) -> str:
     if date_str is None:
         return "N/A"
-    if isinstance(date_str, datetime):
-        dt = date_str
-    elif isinstance(date_str, date):
-        dt = datetime.combine(date_str, datetime.min.time())
-    else:
-        try:
-            dt = datetime.fromisoformat(str(date_str))
-        except ValueError:
-            return str(date_str)
+    if isinstance(date_str, date):  # includes datetime
+        return _format_humanized(date_str)
+    return _humanize_iso(str(date_str))
+
+
+@lru_cache(maxsize=2048)
+def _humanize_iso(value: str) -> str:
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    return _format_humanized(dt)
+
+
+def _format_humanized(dt: date) -> str:
+    month = MONTH_NAMES[dt.month]
     if dt.day == 1:
-        return dt.strftime("%B %Y")
-    return dt.strftime("%B %d, %Y").replace(" 0", " ")
+        return f"{month} {dt.year}"
+    return f"{month} {dt.day}, {dt.year}"
 
 
 def _ensure_cards_dir(path: Path) -> None:
@@ -398,17 +439,24 @@ def _ensure_cards_dir(path: Path) -> None:
         )
 
 
-def _fetch_metadata(con, series_id: Optional[str]) -> Optional[Dict[str, object]]:
+def _fetch_metadata(db_path: Path, series_id: Optional[str]) -> Optional[Dict[str, object]]:
     if not series_id:
         return None
-    row = con.execute(
-        """
-        SELECT series_id, title, units
-        FROM series
-        WHERE series_id = ?
-        """,
-        [series_id],
-    ).fetchone()
+    metadata = _cached_metadata(str(Path(db_path).expanduser().resolve()), series_id)
+    return dict(metadata) if metadata else None
+
+
+@lru_cache(maxsize=256)
+def _cached_metadata(db_key: str, series_id: str) -> Optional[Dict[str, object]]:
+    with warehouse.get_shared_connection(db_key).cursor() as con:
+        row = con.execute(
+            """
+            SELECT series_id, title, units
+            FROM series
+            WHERE series_id = ?
+            """,
+            [series_id],
+        ).fetchone()
     if not row:
         return None
     return {"series_id": row[0], "title": row[1], "units": row[2]}
@@ -455,7 +503,12 @@ def _clarifying_response(parsed, retrieved_docs: List[Dict[str, object]]) -> Dic
 
 
 def _definition_snippet(card_path: Path, max_chars: int = 200) -> Optional[str]:
-    text = card_path.read_text(encoding="utf-8")
+    return _cached_definition_snippet(str(card_path), card_path.stat().st_mtime_ns, max_chars)
+
+
+@lru_cache(maxsize=256)
+def _cached_definition_snippet(card_path_str: str, mtime_ns: int, max_chars: int) -> Optional[str]:
+    text = Path(card_path_str).read_text(encoding="utf-8")
     marker = "## Definition"
     if marker not in text:
         return None
@@ -463,10 +516,10 @@ def _definition_snippet(card_path: Path, max_chars: int = 200) -> Optional[str]:
     if "## " in after:
         after = after.split("## ", 1)[0]
     cleaned = " ".join(line.strip() for line in after.splitlines() if line.strip())
-    cleaned = re.sub(r"https?://\S+", "", cleaned)
+    cleaned = URL_PATTERN.sub("", cleaned)
     if not cleaned:
         return None
-    sentences = re.split(r"(?<=[.!?])\s+", cleaned)
+    sentences = SENTENCE_SPLIT_PATTERN.split(cleaned)
     sentence = ""
     for candidate in sentences:
         candidate = candidate.strip()
@@ -474,7 +527,7 @@ def _definition_snippet(card_path: Path, max_chars: int = 200) -> Optional[str]:
             continue
         if len(candidate.split()) < 6:
             continue
-        if re.search(r"\b\d{4}\s*-\s*\d{4}\b", candidate):
+        if YEAR_RANGE_PATTERN.search(candidate):
             continue
         sentence = candidate
         break
@@ -500,10 +553,9 @@ def _series_id_from_doc(doc_id: str) -> str:
 
 
 def _date_to_str(value):
-    if value is None:
-        return None
-    if isinstance(value, datetime):
-        return value.isoformat()
-    if isinstance(value, date):
+    # Parsed dates are usually ISO strings already.
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, date):  # includes datetime
         return value.isoformat()
     return str(value)
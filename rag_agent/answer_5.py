@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import re
 from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Sequence
 
@@ -15,7 +16,7 @@ if str(ROOT) not in sys.path:
 
 from src import warehouse  # noqa: E402
 from src.parse import DATE_REQUIRED_ERROR, MISSING_SERIES_ERROR, WINDOW_REQUIRED_ERROR, parse_question  # noqa: E402
-from src.retriever import TfidfRetriever  # noqa: E402
+from src.retriever import get_retriever  # noqa: E402
 from src.truth import (  # noqa: E402
     get_ma,
     get_max,
@@ -54,6 +55,32 @@ MONTHS = {
     "dec": 12,
 }
 
+MONTH_ALIASES = {
+    "jan": "january",
+    "feb": "february",
+    "mar": "march",
+    "apr": "april",
+    "may": "may",
+    "jun": "june",
+    "jul": "july",
+    "aug": "august",
+    "sep": "september",
+    "sept": "september",
+    "oct": "october",
+    "nov": "november",
+    "dec": "december",
+}
+# Month aliases are expanded as whole words, optionally with one trailing word character
+# ("sept", "jan5"). The three passes run in calendar order: "may" also absorbs any single
+# character before the next word ("may 2020" -> "may2020"), which hides a following alias
+# from the later pass, so it has to sit between the other two.
+EARLY_MONTH_ALIAS_PATTERN = re.compile(r"\b(jan|feb|mar|apr)\w?\b", re.IGNORECASE)
+MAY_ALIAS_PATTERN = re.compile(r"\bmay(?:.\b|\b)", re.IGNORECASE)
+LATE_MONTH_ALIAS_PATTERN = re.compile(
+    r"\b(sept|jun|jul|aug|sep|oct|nov|dec)\w?\b", re.IGNORECASE
+)
+DASH_TABLE = str.maketrans({"–": "-", "—": "-"})
+
 VALID_TRANSFORMS = {"point", "yoy", "mom", "ma", "max", "min"}
 LLM_TRANSFORM_THRESHOLD = 0.45
 LLM_REFUSAL_THRESHOLD = 0.55
@@ -61,6 +88,42 @@ LLM_REFUSAL_ERROR = (
     "Question appears underspecified—please provide the series name, date, or window."
 )
 
+MOVING_AVERAGE_PATTERN = re.compile(r"(moving\s+average|\bma\b)")
+PERIODS_PATTERN = re.compile(r"(\d+)\s*[- ]?\s*(?:periods?|months?)\s+(?:moving average|ma)")
+WINDOW_PATTERN = re.compile(
+    r"(?:between|from)\s+(?P<start>[A-Za-z0-9\s\-/]+?)\s+(?:and|to)\s+(?P<end>[A-Za-z0-9\s\-/]+)",
+    re.IGNORECASE,
+)
+# Every single-date form in one scan; _extract_single_date applies the
+# priority between them.  The month-year branch only consumes the month
+# word, so a year-month token right after it stays visible to the scan.
+SINGLE_DATE_PATTERN = re.compile(
+    r"\b(?:(?P<iso>\d{4}-\d{2}-\d{2})\b"
+    r"|(?P<compact>\d{6})\b"
+    r"|(?P<ymonth>\d{4}-\d{2})\b"
+    r"|(?P<month>[A-Za-z]+\s+)(?=(?P<year>\d{4})\b))"
+)
+ISO_DATE_TOKEN_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+YEAR_MONTH_TOKEN_PATTERN = re.compile(r"\d{4}-\d{2}")
+MONTH_NAMES = (
+    "",
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+URL_PATTERN = re.compile(r"https?://\S+")
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s+")
+YEAR_RANGE_PATTERN = re.compile(r"\b\d{4}\s*-\s*\d{4}\b")
+
 
 def run(
     question: str,
@@ -74,8 +137,7 @@ def run(
 
     normalized_question = _normalize_question_text(question)
 
-    retriever = TfidfRetriever(cards_dir)
-    retriever.build()
+    retriever = get_retriever(cards_dir)
     retrieved = retriever.retrieve(question, k=3)
     retrieved_summary = [
         {"doc_id": doc["doc_id"], "score": round(doc["score"], 4)} for doc in retrieved
@@ -88,7 +150,7 @@ def run(
     parsed = _validate_parsed_result(parsed)
     parsed = _maybe_infer_series_from_retrieval(parsed, retrieved)
 
-    con = warehouse.get_connection(db_path, read_only=True, retries=3)
+    con = warehouse.get_shared_connection(db_path).cursor()
 
     if getattr(parsed, "_llm_refusal", False):
         return _clarifying_response(parsed, retrieved_summary)
@@ -96,34 +158,19 @@ def run(
     if parsed.missing_series and (parsed.series_id is None):
         return _clarifying_response(parsed, retrieved_summary)
 
-    return _build_response(parsed, con, cards_dir, retrieved_summary)
+    return _build_response(parsed, con, db_path, cards_dir, retrieved_summary)
 
 
+@lru_cache(maxsize=1024)
 def _normalize_question_text(question: str) -> str:
-    text = question
-    month_aliases = {
-        "jan": "january",
-        "feb": "february",
-        "mar": "march",
-        "apr": "april",
-        "may": "may",
-        "jun": "june",
-        "jul": "july",
-        "aug": "august",
-        "sep": "september",
-        "sept": "september",
-        "oct": "october",
-        "nov": "november",
-        "dec": "december",
-    }
-    subs = {}
-    for alias, full in month_aliases.items():
-        subs[alias] = full
-        subs[f"{alias}."] = full
-    for needle, repl in subs.items():
-        text = re.sub(rf"\b{needle}\b", repl, text, flags=re.IGNORECASE)
-    text = text.replace("–", "-").replace("—", "-")
-    return text
+    text = EARLY_MONTH_ALIAS_PATTERN.sub(_expand_month_alias, question)
+    text = MAY_ALIAS_PATTERN.sub("may", text)
+    text = LATE_MONTH_ALIAS_PATTERN.sub(_expand_month_alias, text)
+    return text.translate(DASH_TABLE)
+
+
+def _expand_month_alias(match: re.Match) -> str:
+    return MONTH_ALIASES[match.group(1).casefold()]
 
 
 def _refine_parsed_result(parsed, question: str):
@@ -205,10 +252,10 @@ def _normalize_llm_date(token: Optional[str]) -> Optional[str]:
     if not token:
         return None
     token = token.strip()
-    iso_full = re.fullmatch(r"\d{4}-\d{2}-\d{2}", token)
+    iso_full = ISO_DATE_TOKEN_PATTERN.fullmatch(token)
     if iso_full:
         return iso_full.group(0)
-    iso_month = re.fullmatch(r"\d{4}-\d{2}", token)
+    iso_month = YEAR_MONTH_TOKEN_PATTERN.fullmatch(token)
     if iso_month:
         return f"{iso_month.group(0)}-01"
     month_year = _parse_date_token(token)
@@ -244,27 +291,20 @@ def _detect_transform(text: str) -> Optional[str]:
         return "yoy"
     if any(phrase in text for phrase in ["month-over-month", "month over month", "mom"]):
         return "mom"
-    if re.search(r"(moving\s+average|\bma\b)", text):
+    if MOVING_AVERAGE_PATTERN.search(text):
         return "ma"
     return None
 
 
 def _extract_periods(text: str) -> Optional[int]:
-    match = re.search(
-        r"(\d+)\s*[- ]?\s*(?:periods?|months?)\s+(?:moving average|ma)",
-        text,
-    )
+    match = PERIODS_PATTERN.search(text)
     if match:
         return int(match.group(1))
     return None
 
 
 def _extract_window(question: str) -> Sequence[Optional[str]]:
-    pattern = re.compile(
-        r"(?:between|from)\s+(?P<start>[A-Za-z0-9\s\-/]+?)\s+(?:and|to)\s+(?P<end>[A-Za-z0-9\s\-/]+)",
-        re.IGNORECASE,
-    )
-    match = pattern.search(question)
+    match = WINDOW_PATTERN.search(question)
     if not match:
         return (None, None)
     start = _parse_date_token(match.group("start"))
@@ -273,19 +313,22 @@ def _extract_window(question: str) -> Sequence[Optional[str]]:
 
 
 def _extract_single_date(question: str) -> Optional[str]:
-    iso_date = re.search(r"\b\d{4}-\d{2}-\d{2}\b", question)
-    if iso_date:
-        return iso_date.group(0)
-    compact = re.search(r"\b\d{6}\b", question)
+    first: Dict[str, re.Match] = {}
+    for match in SINGLE_DATE_PATTERN.finditer(question):
+        kind = match.lastgroup
+        if kind == "iso":
+            return match.group(0)
+        first.setdefault(kind, match)
+    compact = first.get("compact")
     if compact:
         token = compact.group(0)
         return f"{token[:4]}-{token[4:]}-01"
-    iso_month = re.search(r"\b\d{4}-\d{2}\b", question)
+    iso_month = first.get("ymonth")
     if iso_month:
         return f"{iso_month.group(0)}-01"
-    month_year = re.search(r"\b([A-Za-z]+)\s+(\d{4})\b", question)
+    month_year = first.get("year")
     if month_year:
-        parsed = _parse_date_token(month_year.group(0))
+        parsed = _parse_date_token(month_year.group("month") + month_year.group("year"))
         if parsed:
             return parsed
     return None
@@ -293,12 +336,13 @@ def _extract_single_date(question: str) -> Optional[str]:
 
 def _parse_date_token(token: str) -> Optional[str]:
     clean = token.strip().strip(".,;:?!")
-    try:
-        return datetime.fromisoformat(clean).date().isoformat()
-    except ValueError:
-        pass
-    if re.fullmatch(r"\d{4}-\d{2}", clean):
+    if YEAR_MONTH_TOKEN_PATTERN.fullmatch(clean):
         return f"{clean}-01"
+    if len(clean) >= 7 and clean[:4].isdigit():
+        try:
+            return datetime.fromisoformat(clean).date().isoformat()
+        except ValueError:
+            pass
     parts = clean.split()
     if len(parts) == 2:
         month = MONTHS.get(parts[0].lower())
@@ -313,6 +357,9 @@ def _parse_date_token(token: str) -> Optional[str]:
 
 
 def _safe_int(value: str) -> Optional[int]:
+    if value.isdecimal():
+        return int(value)
+    # int() also takes signs, underscores and surrounding whitespace.
     try:
         return int(value)
     except ValueError:
@@ -322,6 +369,7 @@ def _safe_int(value: str) -> Optional[int]:
 def _build_response(
     parsed,
     con,
+    db_path: Path,
     cards_dir: Path,
     retrieved_docs: List[Dict[str, object]],
 ) -> Dict[str, object]:
@@ -350,7 +398,7 @@ def _build_response(
         base["parse_trace"] = _build_parse_trace(parsed)
         return base
 
-    metadata = _fetch_metadata(con, parsed.series_id)
+    metadata = _fetch_metadata(db_path, parsed.series_id)
     if not metadata:
         base["errors"].append(f"Series {parsed.series_id} not found in warehouse.")
         base["answer"] = base["errors"][0]
@@ -387,7 +435,6 @@ def _build_response(
     base["value"] = value
     base["value_display"] = value_display
     base["answer"] = answer_text
-    citation_dates = [_date_to_str(d) for d in citation_dates]
     base["citations"] = [
         {
             "doc_id": primary_doc_id,
@@ -464,7 +511,8 @@ def _compute_answer(parsed, con, metadata: Dict[str, object]):
     if value is None or not answer_text:
         return None, None, citation_dates, None
 
-    citation_dates = [d for d in citation_dates if d]
+    # Every branch above only appends truthy dates.
+    citation_dates = [_date_to_str(d) for d in citation_dates]
     return value, value_display, citation_dates, answer_text
 
 
@@ -512,9 +560,10 @@ def _format_value_display(transform: str, value: Optional[float], units: Optiona
     )
     if percent_hint:
         return f"{value:.2f}%"
-    if abs(value) >= 1000:
+    magnitude = abs(value)
+    if magnitude >= 1000:
         return f"{value:,.2f}"
-    if abs(value) >= 1:
+    if magnitude >= 1:
         return f"{value:.2f}"
     return f"{value:.4f}"
 
@@ -522,18 +571,25 @@ def _format_value_display(transform: str, value: Optional[float], units: Optiona
 def _humanize_date(date_str: str) -> str:
     if date_str is None:
         return "N/A"
-    if isinstance(date_str, datetime):
-        dt = date_str
-    elif isinstance(date_str, date):
-        dt = datetime.combine(date_str, datetime.min.time())
-    else:
-        try:
-            dt = datetime.fromisoformat(str(date_str))
-        except ValueError:
-            return str(date_str)
+    if isinstance(date_str, date):  # includes datetime
+        return _format_humanized(date_str)
+    return _humanize_iso(str(date_str))
+
+
+@lru_cache(maxsize=2048)
+def _humanize_iso(value: str) -> str:
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    return _format_humanized(dt)
+
+
+def _format_humanized(dt: date) -> str:
+    month = MONTH_NAMES[dt.month]
     if dt.day == 1:
-        return dt.strftime("%B %Y")
-    return dt.strftime("%B %d, %Y").replace(" 0", " ")
+        return f"{month} {dt.year}"
+    return f"{month} {dt.day}, {dt.year}"
 
 
 def _ensure_doc_in_retrieved(retrieved_docs: List[Dict[str, object]], doc_id: str) -> None:
@@ -573,26 +629,32 @@ def _clarifying_response(parsed, retrieved_docs: List[Dict[str, object]]) -> Dic
 
 
 def _date_to_str(value):
-    if value is None:
-        return None
-    if isinstance(value, datetime):
-        return value.isoformat()
-    if isinstance(value, date):
+    # Parsed dates are usually ISO strings already.
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, date):  # includes datetime
         return value.isoformat()
     return str(value)
 
 
-def _fetch_metadata(con, series_id: Optional[str]) -> Optional[Dict[str, object]]:
+def _fetch_metadata(db_path: Path, series_id: Optional[str]) -> Optional[Dict[str, object]]:
     if not series_id:
         return None
-    row = con.execute(
-        """
-        SELECT series_id, title, units
-        FROM series
-        WHERE series_id = ?
-        """,
-        [series_id],
-    ).fetchone()
+    metadata = _cached_metadata(str(Path(db_path).expanduser().resolve()), series_id)
+    return dict(metadata) if metadata else None
+
+
+@lru_cache(maxsize=256)
+def _cached_metadata(db_key: str, series_id: str) -> Optional[Dict[str, object]]:
+    with warehouse.get_shared_connection(db_key).cursor() as con:
+        row = con.execute(
+            """
+            SELECT series_id, title, units
+            FROM series
+            WHERE series_id = ?
+            """,
+            [series_id],
+        ).fetchone()
     if not row:
         return None
     return {"series_id": row[0], "title": row[1], "units": row[2]}
@@ -624,7 +686,12 @@ def _ensure_cards_dir(path: Path) -> None:
 
 
 def _definition_snippet(card_path: Path, max_chars: int = 200) -> Optional[str]:
-    text = card_path.read_text(encoding="utf-8")
+    return _cached_definition_snippet(str(card_path), card_path.stat().st_mtime_ns, max_chars)
+
+
+@lru_cache(maxsize=256)
+def _cached_definition_snippet(card_path_str: str, mtime_ns: int, max_chars: int) -> Optional[str]:
+    text = Path(card_path_str).read_text(encoding="utf-8")
     marker = "## Definition"
     if marker not in text:
         return None
@@ -632,10 +699,10 @@ def _definition_snippet(card_path: Path, max_chars: int = 200) -> Optional[str]:
     if "## " in after:
         after = after.split("## ", 1)[0]
     cleaned = " ".join(line.strip() for line in after.splitlines() if line.strip())
-    cleaned = re.sub(r"https?://\S+", "", cleaned)
+    cleaned = URL_PATTERN.sub("", cleaned)
     if not cleaned:
         return None
-    sentences = re.split(r"(?<=[.!?])\s+", cleaned)
+    sentences = SENTENCE_SPLIT_PATTERN.split(cleaned)
     sentence = ""
     for candidate in sentences:
         candidate = candidate.strip()
@@ -643,7 +710,7 @@ def _definition_snippet(card_path: Path, max_chars: int = 200) -> Optional[str]:
             continue
         if len(candidate.split()) < 6:
             continue
-        if re.search(r"\b\d{4}\s*-\s*\d{4}\b", candidate):
+        if YEAR_RANGE_PATTERN.search(candidate):
             continue
         sentence = candidate
         break
@@ -2,18 +2,34 @@
 
 from __future__ import annotations
 
+import contextlib
 import json
 import os
 import re
+import sqlite3
+import sys
+import threading
 from dataclasses import dataclass
 from hashlib import sha256
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.util import json_dumps, json_loads  # noqa: E402
 
 MODEL_REL_PATH = Path("models") / "phi4-mini"
-DEFAULT_CACHE_PATH = Path(os.environ.get("MINI_FRED_PHI_CACHE", "")) or (
-    Path.home() / ".cache" / "mini-fred" / "phi4_parser_cache.jsonl"
+DEFAULT_CACHE_PATH = (
+    Path(os.environ["MINI_FRED_PHI_CACHE"]).expanduser()
+    if os.environ.get("MINI_FRED_PHI_CACHE")
+    else Path.home() / ".cache" / "mini-fred" / "phi4_parser_cache.jsonl"
 )
+# Parses live in a SQLite key-value table next to the legacy JSONL file, which is imported
+# once; a row in parser_cache_meta records that the import committed.
+CACHE_STORE_SUFFIX = ".sqlite3"
+LEGACY_IMPORTED_META_KEY = "legacy_jsonl_imported"
 SYSTEM_PROMPT = (
     "You extract structured instructions for a Mini-FRED agent. "
     "Return STRICT JSON with keys: series_guess (string or null), transform (one of "
@@ -23,7 +39,6 @@ SYSTEM_PROMPT = (
 )
 JSON_PATTERN = re.compile(r"\{.*\}", re.DOTALL)
 
-
 @dataclass
 class LLMHints:
     transform: Optional[str] = None
@@ -60,7 +75,12 @@ class _Phi4MiniParser:
         self._device = None
         self._load_error: Optional[str] = None
         self._cache: Dict[str, Dict[str, Any]] = {}
-        self._load_cache()
+        self._store: Optional[sqlite3.Connection] = None
+        self._store_error: Optional[str] = None
+        self._store_lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._generate_lock = threading.Lock()
+        self._use_stored = True
 
     def is_available(self) -> bool:
         if self._load_error:
@@ -72,13 +92,13 @@ class _Phi4MiniParser:
         if not question or not self.is_available():
             return None
         key = sha256(question.encode("utf-8")).hexdigest()
-        if key in self._cache:
-            return self._json_to_hints(self._cache[key])
+        cached = self._cache_get(key)
+        if cached is not None:
+            return self._json_to_hints(cached)
         parsed = self._run_model(question)
         if not parsed:
             return None
-        self._cache[key] = parsed
-        self._append_cache_entry(key, parsed)
+        self._cache_put(key, parsed)
         return self._json_to_hints(parsed)
 
     def _run_model(self, question: str) -> Optional[Dict[str, Any]]:
@@ -88,17 +108,23 @@ class _Phi4MiniParser:
         import torch  # type: ignore[import]
 
         prompt = f"<|system|>\n{SYSTEM_PROMPT}\n<|end|>\n<|user|>\n{question}\n<|end|>\n<|assistant|>\n"
-        inputs = self._tokenizer(prompt, return_tensors="pt")
-        inputs = {k: v.to(self._device) for k, v in inputs.items()}
-        with torch.no_grad():
-            output = self._model.generate(
-                **inputs,
-                max_new_tokens=256,
-                do_sample=False,
-                temperature=0.0,
-            )
-        generated = output[:, inputs["input_ids"].shape[-1] :]
-        text = self._tokenizer.decode(generated[0], skip_special_tokens=True).strip()
+        # The answer worker serves rows on several threads; the shared model and its fast
+        # tokenizer are not safe to drive concurrently, so run one question at a time.
+        with self._generate_lock:
+            inputs = self._tokenizer(prompt, return_tensors="pt")
+            inputs = {k: v.to(self._device) for k, v in inputs.items()}
+            with torch.inference_mode():
+                output = self._model.generate(
+                    **inputs,
+                    max_new_tokens=256,
+                    do_sample=False,
+                    temperature=0.0,
+                    use_cache=True,
+                    pad_token_id=self._tokenizer.eos_token_id,
+                    stopping_criteria=_json_object_stop(self._tokenizer, inputs["input_ids"].shape[-1]),
+                )
+            generated = output[:, inputs["input_ids"].shape[-1] :]
+            text = self._tokenizer.decode(generated[0], skip_special_tokens=True).strip()
         match = JSON_PATTERN.search(text)
         if not match:
             return None
@@ -109,8 +135,16 @@ class _Phi4MiniParser:
         return data
 
     def _ensure_model_loaded(self) -> None:
-        if self._tokenizer is not None and self._model is not None:
+        if self._device is not None:
             return
+        # Threads that miss the cache while another one is loading wait for it
+        # instead of loading a second copy.
+        with self._model_lock:
+            if self._device is not None:
+                return
+            self._load_model()
+
+    def _load_model(self) -> None:
         if not self.model_dir.exists():
             self._load_error = f"Phi-4 Mini weights not found in {self.model_dir}"
             return
@@ -136,7 +170,12 @@ class _Phi4MiniParser:
                 local_files_only=True,
                 trust_remote_code=True,
             )
-            dtype = torch.float16 if torch.cuda.is_available() else torch.float32
+            use_cuda = torch.cuda.is_available()
+            if use_cuda:
+                torch.backends.cuda.matmul.allow_tf32 = True
+                dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+            else:
+                dtype = torch.float32
             self._model = AutoModelForCausalLM.from_pretrained(
                 self.model_dir,
                 local_files_only=True,
@@ -144,39 +183,124 @@ class _Phi4MiniParser:
                 torch_dtype=dtype,
                 low_cpu_mem_usage=True,
             )
-            device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+            device = torch.device("cuda" if use_cuda else "cpu")
             self._model.to(device)
             self._model.eval()
-            self._device = device
             if os.environ.get("MINI_FRED_PHI_DISABLE_CACHE"):
                 self._cache.clear()
+                self._use_stored = False
+            # Set last: a non-None device marks the model as ready for other threads.
+            self._device = device
         except Exception as exc:  # pragma: no cover
             self._load_error = f"Failed to load Phi-4 Mini: {exc}"
             self._tokenizer = None
             self._model = None
 
-    def _load_cache(self) -> None:
-        if not self.cache_path.exists():
-            return
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if key in self._cache:
+            return self._cache[key]
+        if not self._use_stored:
+            return None
+        with self._store_lock:
+            store = self._open_store()
+            if store is None:
+                return None
+            try:
+                row = store.execute(
+                    "SELECT data FROM parser_cache WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+        if row is None:
+            return None
         try:
-            with self.cache_path.open("r", encoding="utf-8") as handle:
-                for line in handle:
-                    try:
-                        entry = json.loads(line.strip())
-                        if "key" in entry and "data" in entry:
-                            self._cache[entry["key"]] = entry["data"]
-                    except json.JSONDecodeError:
-                        continue
-        except OSError:
-            pass
+            data = json_loads(row[0])
+        except json.JSONDecodeError:
+            return None
+        self._cache[key] = data
+        return data
 
-    def _append_cache_entry(self, key: str, data: Dict[str, Any]) -> None:
+    def _cache_put(self, key: str, data: Dict[str, Any]) -> None:
+        self._cache[key] = data
+        with self._store_lock:
+            store = self._open_store()
+            if store is None:
+                return
+            try:
+                store.execute(
+                    "INSERT OR REPLACE INTO parser_cache (key, data) VALUES (?, ?)",
+                    (key, json_dumps(data)),
+                )
+            except (TypeError, sqlite3.Error):
+                pass
+
+    def _open_store(self) -> Optional[sqlite3.Connection]:
+        if self._store is not None or self._store_error is not None:
+            return self._store
+        try:
+            store_path = self.cache_path.with_suffix(CACHE_STORE_SUFFIX)
+            store_path.parent.mkdir(parents=True, exist_ok=True)
+            store = sqlite3.connect(
+                str(store_path), timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            store.execute(
+                "CREATE TABLE IF NOT EXISTS parser_cache (key TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+            store.execute(
+                "CREATE TABLE IF NOT EXISTS parser_cache_meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+        except (OSError, ValueError, sqlite3.Error) as exc:
+            self._store_error = str(exc)
+            return None
+        self._import_legacy_cache(store)
+        self._store = store
+        return store
+
+    def _import_legacy_cache(self, store: sqlite3.Connection) -> None:
+        """Copy the legacy JSONL cache into ``store`` unless a previous run already did.
+
+        The rows and the completion marker commit together, so a failed import leaves
+        nothing behind and is retried on the next run.
+        """
+        try:
+            store.execute("BEGIN IMMEDIATE")
+            done = store.execute(
+                "SELECT 1 FROM parser_cache_meta WHERE key = ?", (LEGACY_IMPORTED_META_KEY,)
+            ).fetchone()
+            rows = self._read_legacy_cache() if done is None else None
+            if rows is not None:
+                # Entries written since the store was created are newer; keep them.
+                store.executemany("INSERT OR IGNORE INTO parser_cache (key, data) VALUES (?, ?)", rows)
+                store.execute(
+                    "INSERT INTO parser_cache_meta (key, value) VALUES (?, ?)",
+                    (LEGACY_IMPORTED_META_KEY, str(len(rows))),
+                )
+            store.execute("COMMIT")
+        except sqlite3.Error:
+            # The store still serves new entries; the import is retried on the next run.
+            if store.in_transaction:
+                with contextlib.suppress(sqlite3.Error):
+                    store.execute("ROLLBACK")
+
+    def _read_legacy_cache(self) -> Optional[List[Tuple[str, str]]]:
+        """Return the legacy JSONL rows, ``[]`` if there is no file, or None if it is unreadable."""
+        if not self.cache_path.is_file():
+            return []
         try:
-            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with self.cache_path.open("a", encoding="utf-8") as handle:
-                handle.write(json.dumps({"key": key, "data": data}) + "\n")
+            lines = self.cache_path.read_bytes().splitlines()
         except OSError:
-            pass
+            return None
+        rows = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entry = json_loads(line)
+                if isinstance(entry, dict) and "key" in entry and "data" in entry:
+                    rows.append((entry["key"], json_dumps(entry["data"])))
+            except (json.JSONDecodeError, UnicodeDecodeError, TypeError):
+                continue
+        return rows
 
     @staticmethod
     def _json_to_hints(payload: Dict[str, Any]) -> LLMHints:
@@ -201,13 +325,64 @@ class _Phi4MiniParser:
         )
 
 
+def _json_object_stop(tokenizer, prompt_len: int):
+    """Stop generation once the first top-level JSON object in the reply has closed."""
+    import torch  # type: ignore[import]
+    from transformers import StoppingCriteria, StoppingCriteriaList  # type: ignore[import]
+
+    class _JsonObjectStop(StoppingCriteria):
+        def __init__(self) -> None:
+            self._seen = prompt_len
+            self._depth = 0
+            self._started = False
+            self._in_string = False
+            self._escaped = False
+            self._done = False
+
+        def __call__(self, input_ids, scores, **kwargs):
+            if not self._done:
+                new_ids = input_ids[0, self._seen :]
+                self._seen = input_ids.shape[-1]
+                self._scan(tokenizer.decode(new_ids, skip_special_tokens=True))
+            return torch.full(
+                (input_ids.shape[0],), self._done, dtype=torch.bool, device=input_ids.device
+            )
+
+        def _scan(self, text: str) -> None:
+            for char in text:
+                if self._in_string:
+                    if self._escaped:
+                        self._escaped = False
+                    elif char == "\\":
+                        self._escaped = True
+                    elif char == '"':
+                        self._in_string = False
+                elif char == "{":
+                    self._depth += 1
+                    self._started = True
+                elif not self._started:
+                    continue
+                elif char == '"':
+                    self._in_string = True
+                elif char == "}":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._done = True
+                        return
+
+    return StoppingCriteriaList([_JsonObjectStop()])
+
+
 _PARSER: Optional[_Phi4MiniParser] = None
+_PARSER_LOCK = threading.Lock()
 
 
 def _get_parser() -> _Phi4MiniParser:
     global _PARSER
     if _PARSER is None:
-        _PARSER = _Phi4MiniParser()
+        with _PARSER_LOCK:
+            if _PARSER is None:
+                _PARSER = _Phi4MiniParser()
     return _PARSER
 
 
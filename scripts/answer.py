@@ -4,11 +4,18 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import contextlib
 import importlib
+import io
 import json
+import socket
 import sys
+import threading
+import traceback
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -16,10 +23,13 @@ if str(ROOT) not in sys.path:
 
 from src.util import resolve_project_root  # noqa: E402
 
+SERVER_IDLE_TIMEOUT_S = 600.0
+SERVER_MAX_THREADS = 4
 
-def parse_args() -> argparse.Namespace:
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Answer Mini-FRED questions via versioned agents.")
-    parser.add_argument("question", help="Natural language question.")
+    parser.add_argument("question", nargs="?", help="Natural language question.")
     parser.add_argument(
         "provider_options",
         nargs="?",
@@ -52,17 +62,49 @@ def parse_args() -> argparse.Namespace:
         default="answer_4",
         help="Agent module name inside rag_agent package (default: answer_4).",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--server",
+        metavar="SOCKET",
+        help="Serve answer requests on a Unix socket instead of answering once.",
+    )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Answer one question per stdin line, printing one JSON response per line.",
+    )
+    args = parser.parse_args(argv)
+    if args.stdin and args.question is not None:
+        parser.error("a question argument cannot be combined with --stdin")
+    if args.question is None and args.server is None and not args.stdin:
+        parser.error("the following arguments are required: question")
+    return args
 
 
-def main() -> None:
-    args = parse_args()
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.server:
+        serve(Path(args.server))
+        return
     project_root = resolve_project_root()
     config_path = _resolve_path(project_root, args.config)
     db_path = _resolve_path(project_root, args.db)
     cards_dir = _resolve_path(project_root, args.cards_dir)
 
     agent = _load_agent(args.agent)
+    if args.stdin:
+        for line in sys.stdin:
+            question = line.strip()
+            if not question:
+                continue
+            response = agent.run(
+                question,
+                config_path=config_path,
+                db_path=db_path,
+                cards_dir=cards_dir,
+            )
+            _ensure_value_display(response)
+            print(json.dumps(response), flush=True)
+        return
     response = agent.run(
         args.question,
         config_path=config_path,
@@ -73,6 +115,149 @@ def main() -> None:
     print(json.dumps(response, indent=2))
 
 
+def serve(
+    socket_path: Path,
+    idle_timeout: float = SERVER_IDLE_TIMEOUT_S,
+    max_threads: int = SERVER_MAX_THREADS,
+) -> None:
+    """Answer requests on ``socket_path`` until no client connects for ``idle_timeout`` seconds.
+
+    Each connection carries one JSON line ``{"argv": [...]}`` (the regular command-line
+    arguments) and receives one JSON line ``{"returncode", "stdout", "stderr"}``. Agents and
+    their imports stay loaded between requests, and up to ``max_threads`` requests run at
+    once. A malformed request gets returncode 2; a client that disconnects early is skipped.
+    Only one server binds a given socket; later instances return immediately.
+
+    While serving, ``sys.stdout``/``sys.stderr`` capture per thread, so ``logging`` handlers
+    created after the server started (e.g. when an agent is first imported) report into the
+    reply. Handlers bound to the real streams earlier write to the worker's own stderr.
+    """
+    import fcntl
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{socket_path}.lock", "w") as lock_handle:
+        try:
+            fcntl.flock(lock_handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return
+        socket_path.unlink(missing_ok=True)
+        real_stdout, real_stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = _ThreadLocalStream(real_stdout), _ThreadLocalStream(real_stderr)
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+                server.bind(str(socket_path))
+                server.listen()
+                server.settimeout(idle_timeout)
+                with concurrent.futures.ThreadPoolExecutor(max_workers=max_threads) as executor:
+                    while True:
+                        try:
+                            conn, _ = server.accept()
+                        except socket.timeout:
+                            break
+                        conn.settimeout(None)
+                        executor.submit(_serve_connection, conn)
+        finally:
+            socket_path.unlink(missing_ok=True)
+            sys.stdout, sys.stderr = real_stdout, real_stderr
+
+
+def _serve_connection(conn: socket.socket) -> None:
+    try:
+        with conn, conn.makefile("rwb") as stream:
+            argv = _request_argv(stream.readline())
+            if argv is None:
+                reply = {
+                    "returncode": 2,
+                    "stdout": "",
+                    "stderr": 'malformed request: expected {"argv": [...]} on one JSON line\n',
+                }
+            else:
+                reply = _answer_request(argv)
+            stream.write(json.dumps(reply).encode("utf-8") + b"\n")
+    except Exception:
+        # A bad or vanished client must not take the worker (and its warm caches) down.
+        traceback.print_exc()
+
+
+def _request_argv(line: bytes) -> Optional[List[str]]:
+    try:
+        request = json.loads(line or b"{}")
+    except ValueError:
+        return None
+    if not isinstance(request, dict):
+        return None
+    argv = request.get("argv") or []
+    if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+        return None
+    return argv
+
+
+def _answer_request(argv: List[str]) -> Dict[str, object]:
+    for flag in ("--server", "--stdin"):
+        if flag in argv:
+            return {"returncode": 2, "stdout": "", "stderr": f"{flag} is not allowed in a request\n"}
+    returncode = 0
+    with _captured_output() as (stdout, stderr):
+        try:
+            main(argv)
+        except SystemExit as exc:
+            if isinstance(exc.code, int) or exc.code is None:
+                returncode = exc.code or 0
+            else:
+                print(exc.code, file=sys.stderr)
+                returncode = 1
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+    return {"returncode": returncode, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+@contextlib.contextmanager
+def _captured_output():
+    """Capture stdout/stderr for this thread under serve(), or process-wide otherwise."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    if isinstance(sys.stdout, _ThreadLocalStream) and isinstance(sys.stderr, _ThreadLocalStream):
+        with sys.stdout.capture(stdout), sys.stderr.capture(stderr):
+            yield stdout, stderr
+    else:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            yield stdout, stderr
+
+
+class _ThreadLocalStream(io.TextIOBase):
+    """Text stream that writes to the current thread's capture buffer, if any, else ``fallback``."""
+
+    def __init__(self, fallback) -> None:
+        super().__init__()
+        self._fallback = fallback
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def capture(self, buffer: io.StringIO):
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = None
+
+    def _target(self):
+        buffer = getattr(self._local, "buffer", None)
+        return self._fallback if buffer is None else buffer
+
+    @property
+    def encoding(self):  # type: ignore[override]
+        return getattr(self._fallback, "encoding", "utf-8")
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+
 def _load_agent(agent_name: str):
     try:
         module = importlib.import_module(f"rag_agent.{agent_name}")
@@ -111,14 +296,17 @@ def _format_value_display(transform: Optional[str], value: object, units: object
     )
     if percent_hint:
         return f"{numeric:.2f}%"
-    if abs(numeric) >= 1000:
+    magnitude = abs(numeric)
+    if magnitude >= 1000:
         return f"{numeric:,.2f}"
-    if abs(numeric) >= 1:
+    if magnitude >= 1:
         return f"{numeric:.2f}"
     return f"{numeric:.4f}"
 
 
+@lru_cache(maxsize=16)
 def _resolve_path(project_root: Path, raw_path: str) -> Path:
+    # Cached: --server calls main() per request with the same few paths.
     path = Path(raw_path).expanduser()
     if not path.is_absolute():
         path = project_root / path
@@ -52,7 +52,7 @@ def main() -> None:
     config = load_series_config(config_path)
     series_entries: List[Dict[str, object]] = config.get("series", [])
 
-    con = warehouse.get_connection(db_path)
+    con = warehouse.get_connection(db_path, read_only=True)
 
     for entry in series_entries:
         series_id = entry["id"]
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Build the TF-IDF index over series cards and save it next to the cards."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.retriever import TfidfRetriever, card_signature  # noqa: E402
+from src.util import resolve_project_root  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Save the series-card TF-IDF index.")
+    parser.add_argument(
+        "--cards-dir",
+        default="corpus/series_cards",
+        help="Directory containing generated series cards (default: corpus/series_cards).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    project_root = resolve_project_root()
+    cards_dir = _resolve_path(project_root, args.cards_dir)
+
+    signature = card_signature(cards_dir)
+    retriever = TfidfRetriever(cards_dir)
+    retriever.build()
+    index_dir = retriever.save_index(signature)
+    print(f"Wrote TF-IDF index for {len(retriever.doc_ids)} cards to {index_dir}")
+
+
+def _resolve_path(project_root: Path, raw_path: str) -> Path:
+    path = Path(raw_path).expanduser()
+    if not path.is_absolute():
+        path = project_root / path
+    return path.resolve()
+
+
+if __name__ == "__main__":
+    main()
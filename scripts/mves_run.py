@@ -96,7 +96,12 @@ def run_answer(question: str, agent: str) -> Dict[str, Any]:
         raise RuntimeError(f"Failed to parse answer.py output: {exc}\nOutput: {completed.stdout}")
 
 
-def run_case(case: Dict[str, Any], db_path: Path, agent: str) -> Dict[str, Any]:
+def run_case(
+    case: Dict[str, Any],
+    db_path: Path,
+    agent: str,
+    truth_cache: Optional[Dict[Any, Optional[float]]] = None,
+) -> Dict[str, Any]:
     question = case["question"]
     try:
         response = run_answer(question, agent)
@@ -110,7 +115,9 @@ def run_case(case: Dict[str, Any], db_path: Path, agent: str) -> Dict[str, Any]:
             "failures": [asdict(failure)],
         }
 
-    failures = [asdict(f) for f in mves_verifiers.verify_case(case, response, db_path)]
+    failures = [
+        asdict(f) for f in mves_verifiers.verify_case(case, response, db_path, truth_cache)
+    ]
     status = "pass" if not failures else "fail"
     return {
         "id": case["id"],
@@ -200,7 +207,11 @@ def write_reports(
 
 
 def _execute_cases(
-    cases: List[Dict[str, Any]], db_path: Path, agent: str, workers: int
+    cases: List[Dict[str, Any]],
+    db_path: Path,
+    agent: str,
+    workers: int,
+    truth_cache: Optional[Dict[Any, Optional[float]]] = None,
 ) -> List[Dict[str, Any]]:
     total = len(cases)
     if workers <= 1:
@@ -208,7 +219,7 @@ def _execute_cases(
         for idx, case in enumerate(cases, start=1):
             print(f"[MVES] ({idx}/{total}) running {case['id']}...", flush=True)
             start = time.perf_counter()
-            result = run_case(case, db_path, agent)
+            result = run_case(case, db_path, agent, truth_cache)
             duration = time.perf_counter() - start
             results.append(result)
             print(
@@ -225,7 +236,7 @@ def _execute_cases(
         idx, case = index_case
         print(f"[MVES] ({idx + 1}/{total}) running {case['id']}...", flush=True)
         start = time.perf_counter()
-        result = run_case(case, db_path, agent)
+        result = run_case(case, db_path, agent, truth_cache)
         duration = time.perf_counter() - start
         return idx, case["id"], result, duration
 
@@ -262,7 +273,11 @@ def main() -> None:
     db_path = Path(args.db)
     agent = args.agent
 
-    results = _execute_cases(cases, db_path, agent, args.workers)
+    # One query per transform family instead of one per case; unbatchable specs fall back.
+    truth_cache = mves_verifiers.compute_truth_batch(
+        db_path, [case.get("truth_spec") for case in cases]
+    )
+    results = _execute_cases(cases, db_path, agent, args.workers, truth_cache)
     summary = summarize(results)
     write_reports(reports_dir, summary, results, agent)
 
@@ -48,7 +48,7 @@ def main() -> None:
     series_entries: List[dict] = config.get("series", [])
     required_series = [entry["id"] for entry in series_entries]
 
-    con = warehouse.get_connection(db_path)
+    con = warehouse.get_connection(db_path, read_only=True)
     failures: list[str] = []
     warnings: list[str] = []
 
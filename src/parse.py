@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional, Tuple
 
 MONTHS = {
@@ -124,7 +125,17 @@ class ParseResult:
 
 
 def parse_question(question: str) -> ParseResult:
-    """Parse a natural-language question into structured directives."""
+    """Parse a natural-language question into structured directives.
+
+    Parses are memoized per question text; every call returns its own copy, so callers may
+    mutate the result freely.
+    """
+    cached = _parse_question_cached(question)
+    return replace(cached, errors=list(cached.errors))
+
+
+@lru_cache(maxsize=1024)
+def _parse_question_cached(question: str) -> ParseResult:
     text = question.strip()
     lowered = text.lower()
 
@@ -213,13 +224,17 @@ def _parse_date_token(token: str) -> Optional[str]:
     clean = clean.strip(".,;:?! ")
     if re.fullmatch(r"[A-Za-z]+-\d{4}", clean):
         clean = clean.replace("-", " ")
-    try:
-        return datetime.fromisoformat(clean).date().isoformat()
-    except ValueError:
-        pass
+    # fromisoformat never accepts YYYY-MM, so handle it before attempting a full date.
     iso_month_match = re.fullmatch(r"\d{4}-\d{1,2}", clean)
     if iso_month_match:
         return _normalize_numeric_month(clean)
+    # ISO dates start with a 4-digit year and are at least 7 characters ("2020W10");
+    # anything else ("march 2020", "2008") would only raise.
+    if len(clean) >= 7 and clean[:4].isdigit():
+        try:
+            return datetime.fromisoformat(clean).date().isoformat()
+        except ValueError:
+            pass
     parts = clean.split()
     if len(parts) == 2:
         month_token = parts[0].rstrip(".").lower()
@@ -249,6 +264,9 @@ def _detect_ma_periods(lowered_question: str) -> int:
 
 
 def _safe_int(value: str) -> Optional[int]:
+    if value.isdecimal():
+        return int(value)
+    # int() also takes signs, underscores and surrounding whitespace.
     try:
         return int(value)
     except ValueError:
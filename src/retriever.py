@@ -2,11 +2,26 @@
 
 from __future__ import annotations
 
+import json
+import math
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
-from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore[import]
-from sklearn.metrics.pairwise import linear_kernel  # type: ignore[import]
+from .util import ensure_directory
+
+# A built index can be saved next to the cards (scripts/build_tfidf_index.py) so that a
+# fresh process answers its first question without importing scikit-learn.
+INDEX_DIRNAME = ".tfidf_cache"
+INDEX_META_FILE = "index.json"
+INDEX_IDF_FILE = "idf.npy"
+INDEX_MATRIX_FILE = "doc_matrix.npz"
+
+# TfidfVectorizer's default token pattern, spelled out because saved indexes re-apply it.
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+CardSignature = Tuple[Tuple[str, int, int], ...]
 
 
 class TfidfRetriever:
@@ -14,18 +29,19 @@ class TfidfRetriever:
 
     def __init__(self, cards_dir: Path):
         self.cards_dir = Path(cards_dir)
-        self.vectorizer = TfidfVectorizer(
-            stop_words="english",
-            ngram_range=(1, 2),
-            sublinear_tf=True,
-            min_df=1,
-        )
+        self.vectorizer = None
         self.doc_ids: List[str] = []
         self.documents: List[str] = []
         self.matrix = None
+        # Query-side state when loaded from a saved index instead of fitted.
+        self._vocabulary: Dict[str, int] = {}
+        self._idf = None
+        self._stop_words: FrozenSet[str] = frozenset()
 
     def build(self) -> None:
         """Load all markdown cards and build the TF-IDF index."""
+        from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore[import]
+
         if not self.cards_dir.exists():
             raise FileNotFoundError(
                 f"Cards directory {self.cards_dir} not found. Generate cards first."
@@ -45,8 +61,75 @@ class TfidfRetriever:
                 f"No markdown files found in {self.cards_dir}; run build_series_cards."
             )
 
+        self.vectorizer = TfidfVectorizer(
+            stop_words="english",
+            token_pattern=TOKEN_PATTERN.pattern,
+            ngram_range=(1, 2),
+            sublinear_tf=True,
+            min_df=1,
+        )
         self.matrix = self.vectorizer.fit_transform(self.documents)
 
+    def save_index(self, signature: CardSignature) -> Path:
+        """Write the built index under ``cards_dir/.tfidf_cache`` for :meth:`load_cached`.
+
+        ``signature`` should be taken with :func:`card_signature` before :meth:`build` so that
+        cards edited during the build mark the saved index as stale.
+        """
+        import numpy as np
+        from scipy import sparse  # type: ignore[import]
+
+        if self.vectorizer is None or self.matrix is None:
+            raise RuntimeError("Build the index before saving it.")
+        index_dir = ensure_directory(self.cards_dir / INDEX_DIRNAME)
+        meta_path = index_dir / INDEX_META_FILE
+        # Drop the metadata first: without it a half-written index is never loaded.
+        meta_path.unlink(missing_ok=True)
+        np.save(index_dir / INDEX_IDF_FILE, self.vectorizer.idf_)
+        sparse.save_npz(index_dir / INDEX_MATRIX_FILE, self.matrix)
+        meta = {
+            "signature": [list(entry) for entry in signature],
+            "doc_ids": self.doc_ids,
+            "documents": self.documents,
+            "vocabulary": {term: int(idx) for term, idx in self.vectorizer.vocabulary_.items()},
+            "stop_words": sorted(self.vectorizer.get_stop_words() or ()),
+        }
+        tmp_path = meta_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+        tmp_path.replace(meta_path)
+        return index_dir
+
+    @classmethod
+    def load_cached(
+        cls, cards_dir: Path, signature: Optional[CardSignature] = None
+    ) -> Optional["TfidfRetriever"]:
+        """Return a retriever backed by the saved index, or None if it is missing or stale."""
+        cards_dir = Path(cards_dir)
+        if signature is None:
+            signature = card_signature(cards_dir)
+        index_dir = cards_dir / INDEX_DIRNAME
+        try:
+            meta = json.loads((index_dir / INDEX_META_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if tuple(tuple(entry) for entry in meta.get("signature", ())) != signature:
+            return None
+
+        import numpy as np
+        from scipy import sparse  # type: ignore[import]
+
+        retriever = cls(cards_dir)
+        try:
+            retriever.matrix = sparse.load_npz(index_dir / INDEX_MATRIX_FILE)
+            retriever._idf = np.load(index_dir / INDEX_IDF_FILE, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        retriever.doc_ids = list(meta["doc_ids"])
+        retriever.documents = list(meta["documents"])
+        retriever._vocabulary = meta["vocabulary"]
+        retriever._stop_words = frozenset(meta["stop_words"])
+        return retriever
+
     def retrieve(self, query: str, k: int = 3) -> List[Dict[str, object]]:
         """Return top-k documents ranked by cosine similarity."""
         if not query.strip():
@@ -54,8 +137,10 @@ class TfidfRetriever:
         if not self.doc_ids or self.matrix is None:
             return []
 
-        query_vec = self.vectorizer.transform([query])
-        scores = linear_kernel(query_vec, self.matrix).ravel()
+        query_vec = self._encode_query(query)
+        # Rows are L2-normalised, so the sparse dot product is the cosine similarity;
+        # same product linear_kernel computes, minus its per-call input validation.
+        scores = (query_vec @ self.matrix.T).toarray().ravel()
         ranked_indices = scores.argsort()[::-1][:k]
 
         results: List[Dict[str, object]] = []
@@ -71,3 +156,63 @@ class TfidfRetriever:
                 }
             )
         return results
+
+    def _encode_query(self, query: str):
+        if self.vectorizer is not None:
+            return self.vectorizer.transform([query])
+
+        import numpy as np
+        from scipy import sparse  # type: ignore[import]
+
+        # Mirrors the fitted vectorizer step for step (lowercase, tokenise, drop stop words,
+        # add bigrams, sublinear tf * idf, L2 norm) so scores match a freshly built index.
+        tokens = [token for token in TOKEN_PATTERN.findall(query.lower()) if token not in self._stop_words]
+        counts: Dict[int, int] = {}
+        for term in tokens + [" ".join(pair) for pair in zip(tokens, tokens[1:])]:
+            idx = self._vocabulary.get(term)
+            if idx is not None:
+                counts[idx] = counts.get(idx, 0) + 1
+        indices = sorted(counts)
+        data = np.array([counts[idx] for idx in indices], dtype=np.float64)
+        np.log(data, data)
+        data += 1.0
+        data *= self._idf[indices]
+        norm = 0.0
+        for weight in data.tolist():
+            norm += weight * weight
+        if norm:
+            data /= math.sqrt(norm)
+        return sparse.csr_matrix(
+            (data, np.array(indices, dtype=np.int32), np.array([0, len(indices)], dtype=np.int32)),
+            shape=(1, self.matrix.shape[1]),
+        )
+
+
+def card_signature(cards_dir: Path) -> CardSignature:
+    """Return ``(name, mtime_ns, size)`` for every card; any add, remove, or edit changes it."""
+    signature = []
+    for path in sorted(Path(cards_dir).glob("*.md")):
+        stat = path.stat()
+        signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def get_retriever(cards_dir: Path) -> TfidfRetriever:
+    """Return a built retriever for ``cards_dir``, reused until any card is added, removed, or edited.
+
+    A saved index (see :meth:`TfidfRetriever.save_index`) is used when it matches the cards.
+    The instance is shared between callers, so only call ``retrieve`` on it.
+    """
+    cards_dir = Path(cards_dir)
+    if not cards_dir.exists():
+        TfidfRetriever(cards_dir).build()  # raises the usual FileNotFoundError
+    return _build_retriever(cards_dir.resolve(), card_signature(cards_dir))
+
+
+@lru_cache(maxsize=4)
+def _build_retriever(cards_dir: Path, signature: CardSignature) -> TfidfRetriever:
+    retriever = TfidfRetriever.load_cached(cards_dir, signature)
+    if retriever is None:
+        retriever = TfidfRetriever(cards_dir)
+        retriever.build()
+    return retriever
@@ -32,10 +32,10 @@ def get_yoy(con, series_id: str, target_date: str) -> Optional[float]:
     current_value = get_point(con, series_id, target_date)
     if current_value is None:
         return None
-    freq = _get_frequency(con, series_id)
-    base_date = _shift_for_yoy(target_date, freq)
+    freq = get_frequency(con, series_id)
+    base_date = shift_for_yoy(target_date, freq)
     prev_value = get_point(con, series_id, base_date)
-    return _percent_change(current_value, prev_value)
+    return percent_change(current_value, prev_value)
 
 
 def get_mom(con, series_id: str, target_date: str) -> Optional[float]:
@@ -45,10 +45,10 @@ def get_mom(con, series_id: str, target_date: str) -> Optional[float]:
     current_value = get_point(con, series_id, target_date)
     if current_value is None:
         return None
-    freq = _get_frequency(con, series_id)
-    base_date = _shift_for_mom(target_date, freq)
+    freq = get_frequency(con, series_id)
+    base_date = shift_for_mom(target_date, freq)
     prev_value = get_point(con, series_id, base_date)
-    return _percent_change(current_value, prev_value)
+    return percent_change(current_value, prev_value)
 
 
 def select_trailing_window(
@@ -141,7 +141,8 @@ def get_min(
     return row[0], float(row[1]) if row[1] is not None else None
 
 
-def _get_frequency(con, series_id: str) -> str:
+def get_frequency(con, series_id: str) -> str:
+    """Return the (cached) frequency label recorded for a series."""
     cached = _FREQUENCY_CACHE.get(series_id)
     if cached is not None:
         return cached
@@ -153,7 +154,8 @@ def _get_frequency(con, series_id: str) -> str:
     return freq
 
 
-def _shift_for_yoy(target_date: str, frequency: str) -> str:
+def shift_for_yoy(target_date: str, frequency: str) -> str:
+    """Return the base date used for a year-over-year comparison."""
     dt = _parse_date(target_date)
     if dt is None:
         return target_date
@@ -163,7 +165,8 @@ def _shift_for_yoy(target_date: str, frequency: str) -> str:
     return shifted.isoformat()
 
 
-def _shift_for_mom(target_date: str, frequency: str) -> str:
+def shift_for_mom(target_date: str, frequency: str) -> str:
+    """Return the base date used for a period-over-period comparison."""
     dt = _parse_date(target_date)
     if dt is None:
         return target_date
@@ -179,7 +182,8 @@ def _shift_for_mom(target_date: str, frequency: str) -> str:
     return shifted.isoformat()
 
 
-def _percent_change(current: Optional[float], previous: Optional[float]) -> Optional[float]:
+def percent_change(current: Optional[float], previous: Optional[float]) -> Optional[float]:
+    """Return the percent change from previous to current, or None if undefined."""
     if current is None or previous in (None, 0):
         return None
     return (current - previous) / previous * 100.0
@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
+import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Mapping
+from typing import IO, Any, Mapping, Tuple
 
-import yaml  # type: ignore[import]
+try:
+    import orjson  # type: ignore[import]
+except ModuleNotFoundError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
 
 
+@lru_cache(maxsize=8)
 def resolve_project_root(start: Path | None = None) -> Path:
-    """Return the Mini-FRED project root (directory that contains pyproject.toml)."""
+    """Return the Mini-FRED project root (directory that contains pyproject.toml).
+
+    Successful lookups are cached for the life of the process.
+    """
     current = start or Path(__file__).resolve().parent.parent
     sentinel = "pyproject.toml"
     for candidate in [current, *current.parents]:
@@ -21,12 +30,56 @@ def resolve_project_root(start: Path | None = None) -> Path:
 
 
 def load_series_config(config_path: str | Path) -> Mapping[str, Any]:
-    """Load the YAML configuration that describes series, date windows, and policies."""
+    """Load the YAML configuration that describes series, date windows, and policies.
+
+    Parsed configs are cached per (path, mtime); treat the returned mapping as read-only.
+    """
     cfg_path = Path(config_path).expanduser().resolve()
     if not cfg_path.exists():
         raise FileNotFoundError(f"Config file not found: {cfg_path}")
+    return _load_yaml_cached(cfg_path, cfg_path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load_yaml_cached(cfg_path: Path, mtime_ns: int) -> Mapping[str, Any]:
     with cfg_path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle) or {}
+        return yaml_safe_load(handle) or {}
+
+
+def yaml_safe_load(stream: str | IO[str]) -> Any:
+    """Parse YAML with PyYAML's safe loader, importing PyYAML on first use.
+
+    Raises ``ModuleNotFoundError`` when PyYAML is not installed, so callers that also
+    accept JSON can fall back to it.
+    """
+    yaml, loader = _yaml_safe_loader()
+    return yaml.load(stream, Loader=loader)
+
+
+@lru_cache(maxsize=None)
+def _yaml_safe_loader() -> Tuple[Any, Any]:
+    import yaml  # type: ignore[import]
+
+    # libyaml-backed loader when PyYAML was built with it; same safe semantics, much faster parsing.
+    return yaml, getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader
+
+
+def json_loads(data: str | bytes) -> Any:
+    """``json.loads`` backed by orjson when installed; errors subclass ``json.JSONDecodeError``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(payload: Any) -> str:
+    """Compact JSON text, via orjson when installed.
+
+    For internal caches only: orjson writes NaN as null and non-ASCII text unescaped, and
+    raises ``TypeError`` on non-string keys.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload).decode("utf-8")
+    return json.dumps(payload)
 
 
 def ensure_directory(path: str | Path) -> Path:
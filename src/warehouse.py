@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import atexit
 import contextlib
+import threading
 from pathlib import Path
-from typing import Iterable, Mapping, Sequence
+from typing import Dict, Iterable, Mapping, Sequence
 
 import duckdb  # type: ignore[import]
 
 from .util import ensure_directory
 
+_SHARED_CONNECTIONS: Dict[str, duckdb.DuckDBPyConnection] = {}
+_SHARED_LOCK = threading.Lock()
+
 
 def get_connection(
     db_path: str | Path,
@@ -31,6 +36,33 @@ def get_connection(
                 raise
 
 
+def get_shared_connection(db_path: str | Path) -> duckdb.DuckDBPyConnection:
+    """Return a process-wide read-only connection for the database, opened on first use.
+
+    Callers should run queries on ``.cursor()`` (one per thread) and must not close it.
+    """
+    key = str(Path(db_path).expanduser().resolve())
+    con = _SHARED_CONNECTIONS.get(key)
+    if con is not None:
+        return con
+    with _SHARED_LOCK:
+        con = _SHARED_CONNECTIONS.get(key)
+        if con is None:
+            con = duckdb.connect(key, read_only=True)
+            _SHARED_CONNECTIONS[key] = con
+    return con
+
+
+@atexit.register
+def close_shared_connections() -> None:
+    """Close every connection opened by :func:`get_shared_connection`."""
+    with _SHARED_LOCK:
+        connections = list(_SHARED_CONNECTIONS.values())
+        _SHARED_CONNECTIONS.clear()
+    for con in connections:
+        with contextlib.suppress(duckdb.Error):
+            con.close()
+
 
 def create_schema(con) -> None:
     """Create the Mini-FRED schema in DuckDB if it does not already exist."""
@@ -5,7 +5,7 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from src.parse import parse_question
+from src.parse import _parse_date_token, parse_question
 
 
 def _assert_date(question: str, expected: str) -> None:
@@ -56,3 +56,11 @@ def test_detect_max_min_synonyms():
     assert result.transform == "max"
     result = parse_question("How low did CPI get between January 2010 and March 2012?")
     assert result.transform == "min"
+
+
+def test_parse_date_token_iso_formats():
+    assert _parse_date_token("2020W10") == "2020-03-02"
+    assert _parse_date_token("2020-W10") == "2020-03-02"
+    assert _parse_date_token("20200301") == "2020-03-01"
+    assert _parse_date_token("2020-03") == "2020-03-01"
+    assert _parse_date_token("2008") is None
@@ -0,0 +1,75 @@
+from pathlib import Path
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.retriever import TfidfRetriever, card_signature  # noqa: E402
+
+CARDS = {
+    "series_UNRATE": "# Unemployment Rate\n\n## Definition\nThe unemployment rate is the share of the labor force that is jobless.\n",
+    "series_CPIAUCSL": "# Consumer Price Index\n\n## Definition\nCPI for all urban consumers measures the average change in prices paid.\n",
+    "series_FEDFUNDS": "# Federal Funds Rate\n\n## Definition\nThe federal funds rate is the interest rate banks charge each other overnight.\n",
+    "series_GDPC1": "# Real GDP\n\n## Definition\nReal gross domestic product, chained 2017 dollars, seasonally adjusted.\n",
+}
+
+QUERIES = [
+    "What was the unemployment rate in April 2020?",
+    "CPI urban consumers prices",
+    "federal funds rate federal funds rate",
+    "Real GDP growth",
+    "the and of",
+    "naïve Café PRICES paid",
+    "rate",
+    "x",
+    "interest rate banks charge",
+]
+
+
+@pytest.fixture
+def cards_dir(tmp_path):
+    for name, text in CARDS.items():
+        (tmp_path / f"{name}.md").write_text(text, encoding="utf-8")
+    return tmp_path
+
+
+def _saved(cards_dir):
+    signature = card_signature(cards_dir)
+    fitted = TfidfRetriever(cards_dir)
+    fitted.build()
+    fitted.save_index(signature)
+    return fitted
+
+
+def test_loaded_index_encodes_queries_like_the_vectorizer(cards_dir):
+    fitted = _saved(cards_dir)
+    loaded = TfidfRetriever.load_cached(cards_dir)
+    assert loaded is not None
+    assert loaded.vectorizer is None
+    for query in QUERIES:
+        expected = fitted.vectorizer.transform([query])
+        actual = loaded._encode_query(query)
+        assert actual.shape == expected.shape
+        assert np.array_equal(actual.indices, expected.indices), query
+        assert np.array_equal(actual.data, expected.data), query
+        expected_ids = [doc["doc_id"] for doc in fitted.retrieve(query, k=3)]
+        assert [doc["doc_id"] for doc in loaded.retrieve(query, k=3)] == expected_ids
+
+
+def test_changed_cards_invalidate_the_saved_index(cards_dir):
+    _saved(cards_dir)
+    assert TfidfRetriever.load_cached(cards_dir) is not None
+
+    card = cards_dir / "series_GDPC1.md"
+    stat = card.stat()
+    os.utime(card, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert TfidfRetriever.load_cached(cards_dir) is None
+
+    _saved(cards_dir)
+    (cards_dir / "series_PCEPI.md").write_text("# PCE Price Index\n", encoding="utf-8")
+    assert TfidfRetriever.load_cached(cards_dir) is None
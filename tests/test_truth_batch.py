@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import duckdb  # noqa: E402
+
+from mves.verifiers import _compute_truth, compute_truth_batch, truth_key  # noqa: E402
+from src import warehouse  # noqa: E402
+
+MONTHLY = "TBATCH_MONTHLY"
+QUARTERLY = "TBATCH_QUARTERLY"
+DAILY = "TBATCH_DAILY"
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("truth_batch") / "warehouse.duckdb"
+    con = duckdb.connect(str(path))
+    warehouse.create_schema(con)
+    for series_id, frequency in ((MONTHLY, "Monthly"), (QUARTERLY, "Quarterly"), (DAILY, "Daily")):
+        con.execute(
+            "INSERT INTO series (series_id, title, frequency) VALUES (?, ?, ?)",
+            [series_id, series_id.title(), frequency],
+        )
+    rows = []
+    for index in range(36):
+        day = date(2019 + index // 12, index % 12 + 1, 1)
+        if day == date(2020, 9, 1):
+            continue  # gap
+        value = None if day == date(2020, 6, 1) else 100.0 + (index * 7) % 13 - 0.1 * index
+        if day == date(2019, 2, 1):
+            value = 0.0  # zero base for yoy/mom
+        rows.append((MONTHLY, day, value))
+    for index in range(12):
+        rows.append((QUARTERLY, date(2019 + index // 4, 3 * (index % 4) + 1, 1), 50.0 + index * 1.5))
+    for index in range(400):
+        rows.append((DAILY, date(2020, 1, 1) + timedelta(days=index), 10.0 + (index % 17) / 3))
+    con.executemany("INSERT INTO observations VALUES (?, ?, ?)", rows)
+    con.close()
+    return path
+
+
+def _specs():
+    dates = ["2019-01-01", "2019-02-01", "2019-03-01", "2020-02-01", "2020-06-01", "2020-07-01",
+             "2020-09-01", "2020-10-01", "2021-12-01", "2022-01-01", "2018-12-01"]
+    specs = []
+    for series_id in (MONTHLY, QUARTERLY):
+        for day in dates:
+            for transform in ("point", "yoy", "mom"):
+                specs.append({"series_id": series_id, "transform": transform, "date": day})
+            for periods in (1, 3, 12, 40):
+                specs.append({"series_id": series_id, "transform": "ma", "date": day, "periods": periods})
+    for day in ("2020-01-01", "2020-03-01", "2021-01-05", "2021-02-04"):
+        for transform in ("point", "yoy", "mom"):
+            specs.append({"series_id": DAILY, "transform": transform, "date": day})
+        specs.append({"series_id": DAILY, "transform": "ma", "date": day, "periods": 7})
+    windows = [
+        ("2019-01-01", "2021-12-01"),
+        ("2021-12-01", "2019-01-01"),  # reversed
+        ("2020-05-15", "2020-06-15"),  # only a NULL observation
+        ("2020-09-01", "2020-09-01"),  # gap
+        ("2020-03-01", "2020-03-01"),  # single day
+        ("2019-06-01", "2019-03-01"),
+        ("2030-01-01", "2031-01-01"),  # no data
+    ]
+    for series_id in (MONTHLY, QUARTERLY, DAILY):
+        for start, end in windows:
+            for transform in ("max", "min"):
+                specs.append(
+                    {"series_id": series_id, "transform": transform, "window": {"start": start, "end": end}}
+                )
+    return specs
+
+
+def test_batch_matches_per_case_truth(db_path):
+    specs = _specs()
+    batch = compute_truth_batch(db_path, specs)
+    for spec in specs:
+        key = truth_key(spec)
+        assert key in batch, spec
+        assert batch[key] == _compute_truth(db_path, spec), spec
+
+
+def test_batch_skips_specs_it_cannot_key(db_path):
+    specs = [
+        {"series_id": MONTHLY, "transform": "point", "date": "2020-02"},
+        {"series_id": MONTHLY, "transform": "ma", "date": "2020-02-01", "periods": 0},
+        {"series_id": MONTHLY, "transform": "max", "window": {"start": "2020", "end": "2021-01-01"}},
+        {"series_id": MONTHLY, "transform": "avg", "date": "2020-02-01"},
+        "not a spec",
+    ]
+    assert compute_truth_batch(db_path, specs) == {}